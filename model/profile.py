@@ -2,36 +2,36 @@
 User profile model.
 """
 
-from enum import Enum, auto
+from enum import Enum
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Optional
 
 
 class Gender(Enum):
     """Enumeration of user gender options."""
-    MALE = auto()
-    FEMALE = auto()
-    OTHER = auto()
+    # (id, bonus coefficient for daily water norm calculation)
+    MALE = (1, 0.25)
+    FEMALE = (2, 0.1)
+    OTHER = (3, 0.15)
+    
+    def __init__(self, _id: int, bonus: float):
+        self.bonus = bonus
     
     def get_bonus(self) -> float:
         """Returns bonus coefficient for daily water norm calculation."""
-        if self == Gender.MALE:
-            return 0.25
-        elif self == Gender.FEMALE:
-            return 0.1
-        else:  # OTHER
-            return 0.15
+        return self.bonus
 
 
-@dataclass
+@dataclass(frozen=True)
 class Profile:
-    """User profile model."""
+    """User profile model. Immutable, so the daily target is computed once."""
     height_cm: int
     weight_kg: float
     age_years: int
     gender: Gender
     
-    @property
+    @cached_property
     def daily_target_ml(self) -> int:
         """
         Calculates daily water intake target in milliliters.
@@ -46,13 +46,13 @@ class Profile:
         formula = (0.035 * self.weight_kg) + \
                   (0.002 * self.height_cm) - \
                   (0.0002 * self.age_years) + \
-                  self.gender.get_bonus()
+                  self.gender.bonus
         
         # Convert to ml and round to nearest integer
         return round(formula * 1000)
 
 
-@dataclass
+@dataclass(slots=True)
 class WaterLog:
     """Water consumption record."""
     amount_ml: int
@@ -2,16 +2,27 @@
 Module for working with JSON data files.
 """
 
+import atexit
+import bisect
 import json
 import os
 import hashlib
+import heapq
+import threading
 import time
 import logging
+import math
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 
 from model.profile import Profile, WaterLog, Gender
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Logging configuration
 logging.basicConfig(level=logging.INFO, 
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -19,39 +30,303 @@ logging.basicConfig(level=logging.INFO,
 logger = logging.getLogger(__name__)
 
 
+def _read_file(path: str) -> bytearray:
+    """
+    Read whole file with a single read into a buffer of the file's size.
+    
+    Args:
+        path: Path to file.
+        
+    Returns:
+        File contents.
+    """
+    with open(path, 'rb', buffering=0) as f:
+        buf = bytearray(os.fstat(f.fileno()).st_size)
+        n = f.readinto(buf)
+        
+        # File changed size since fstat
+        if n < len(buf):
+            del buf[n:]
+        else:
+            buf += f.read()
+    
+    return buf
+
+
+def _write_file(path: str, data: bytes, durable: bool = False) -> None:
+    """
+    Atomically replace file contents with a single write.
+    
+    Data is written to a temporary file next to the target, which is then
+    renamed over it, so readers never see a partially written file.
+    
+    Args:
+        path: Path to file.
+        data: New file contents.
+        durable: Flush contents to disk before the rename.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# Write-ahead log records after which write-back mode saves a snapshot
+WAL_SNAPSHOT_RECORDS = 1000
+
+# Key of saved file holding the sequence number of the last write-ahead log
+# record it includes; sorts after "water_logs", so cached hash states of
+# the payload stay valid (see DataStore._calculate_checksum)
+WAL_SEQUENCE_KEY = "write_ahead_log_sequence"
+
+# Encoder of checksummed data; equivalent to json.dumps(obj, sort_keys=True)
+_canonical_encoder = json.JSONEncoder(sort_keys=True)
+
+
+def _canonical_json(obj: Any) -> bytes:
+    """Encode object to canonical JSON bytes (sorted keys, default separators)."""
+    return _canonical_encoder.encode(obj).encode()
+
+
+def _json_loads(data: bytes) -> Any:
+    """
+    Decode JSON bytes, using orjson if it is installed.
+    
+    orjson rejects NaN and Infinity, which the stdlib encoder writes, so
+    such documents are decoded with the stdlib parser instead.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """
+    Encode object to compact JSON bytes, using orjson if it is installed.
+    
+    Not used for checksummed data: checksums are defined over the
+    stdlib json.dumps form (see DataStore._serialize).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
 class DataStore:
     """Class for storing data in JSON files."""
     
-    def __init__(self, file_path: str = "watertracker.json"):
+    def __init__(self, file_path: str = "watertracker.json", write_back: bool = False,
+                 background: bool = False):
         """
         Initialize data storage.
         
         Args:
             file_path: Path to JSON file.
+            write_back: If True, mutations are kept in memory and written
+                to disk only by flush() (also called at interpreter exit).
+                Each mutation is appended to a write-ahead log file
+                meanwhile, so it survives a crash.
+            background: If True, save() only serializes data and a writer
+                thread writes it to disk; flush() waits for the write.
         """
         self.file_path = file_path
+        self.wal_path = os.path.splitext(file_path)[0] + ".wal"
+        self.write_back = write_back
+        
+        # Stored data. The profile dict and the "water_logs" list may be
+        # replaced and records appended, but the profile and records must
+        # not be modified in place: cached encodings, timestamps, running
+        # totals and the profile object are checked only by object identity
+        # and list length. Use update_water_log() and save_profile() instead
         self.data: Dict[str, Any] = {
             "profile": None,
             "water_logs": [],
             "checksum": ""
         }
         
-        # Load data from file if exists
-        if os.path.exists(file_path):
-            self.load()
+        # True if in-memory data has changes not yet written to disk
+        self._dirty = False
+        
+        # Incremented on every change of in-memory data, so callers can tell
+        # whether results they cached are still current
+        self.revision = 0
+        
+        # Checksum of the data last written to (or loaded from) file
+        self._saved_checksum = ""
+        
+        # Cached hash states of payload prefixes (see _calculate_checksum)
+        self._hash_prefix = b""
+        self._hash_prefix_state = hashlib.sha256()
+        self._hash_tail = b""
+        self._hash_tail_state = hashlib.sha256()
+        
+        # Timestamp column of water logs and the list it was built from
+        self._dir_ensured = False
+        self._profile: Optional[Profile] = None
+        self._profile_dict: Optional[Dict[str, Any]] = None
+        self._timestamps: List[float] = []
+        self._timestamps_sorted = True
+        self._indexed_logs: Optional[List[Dict[str, Any]]] = None
+        
+        # Running totals of amounts, built on demand (amount_sums[i] is the
+        # total of the first i records)
+        self._amount_sums: Optional[List[int]] = None
+        
+        # Canonical JSON of each record, built on demand
+        self._encoded_logs: Optional[List[bytes]] = None
+        
+        # Write-ahead log state: lines not yet saved to JSON file, and
+        # sequence number of the last record that was (records are numbered
+        # from 1 and numbering continues across restarts)
+        self._wal_fd: Optional[int] = None
+        self._wal_lines: List[bytes] = []
+        self._wal_base = 0
+        self._wal_lock = threading.Lock()
+        
+        # Background writer state
+        self.background = background
+        self._writer: Optional[threading.Thread] = None
+        self._writer_cond = threading.Condition()
+        self._pending: Optional[Tuple[bytes, int, bool]] = None
+        self._writing = False
+        self._write_result = True
+        
+        # True while a snapshot queued by _commit() is not yet written
+        self._snapshot_queued = False
+        
+        # Worker thread for exports, started on first export_data_async()
+        self._export_executor: Optional[ThreadPoolExecutor] = None
+        
+        # Load data from file if exists (an empty file holds no data)
+        loaded = True
+        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+            loaded = self.load()
+        
+        # Replay water logs added after the last save. If the file failed to
+        # load, the store stays clean, so neither the file nor its log is
+        # written over until data is changed, saved or imported
+        if loaded and os.path.exists(self.wal_path):
+            self._replay_wal()
+        
+        if write_back or background:
+            atexit.register(self.flush)
+    
+    def _serialize(self, data: Dict[str, Any]) -> bytes:
+        """
+        Serialize data without checksum field to canonical JSON bytes.
+        
+        The same bytes are hashed and written to disk, so data is
+        encoded only once per save. Output is identical to
+        json.dumps(data, sort_keys=True); the encoding of each stored
+        water log is cached, so only new or changed records are encoded.
+        
+        Args:
+            data: Data, with or without checksum field.
+            
+        Returns:
+            Canonical JSON bytes (sorted keys).
+        """
+        log_dicts = self.data.get("water_logs")
+        if data.get("water_logs") is not log_dicts or not isinstance(log_dicts, list):
+            return _canonical_json({key: value for key, value in data.items() if key != "checksum"})
+        
+        items = []
+        for key in sorted(key for key in data if key != "checksum"):
+            if key == "water_logs":
+                value = b"[" + b", ".join(self._encoded_log_column()) + b"]"
+            else:
+                value = _canonical_json(data[key])
+            items.append(_canonical_json(key) + b": " + value)
+        
+        return b"{" + b", ".join(items) + b"}"
+    
+    def _encoded_log_column(self) -> List[bytes]:
+        """
+        Get canonical JSON of all water consumption records.
+        
+        Invalidated together with the timestamp column.
+        
+        Returns:
+            List of encoded records in record order.
+        """
+        self._timestamp_column()
+        if self._encoded_logs is None:
+            self._encoded_logs = [_canonical_json(log_dict) for log_dict in self.data["water_logs"]]
+        return self._encoded_logs
     
-    def _calculate_checksum(self, data_without_checksum: Dict[str, Any]) -> str:
+    def _calculate_checksum(self, payload: bytes) -> str:
         """
-        Calculate SHA-256 checksum for data.
+        Calculate SHA-256 checksum for serialized data.
+        
+        Hash states are cached for two prefixes of the payload: the part
+        up to the end of the water logs list, so records added since the
+        last save are the only bytes hashed again, and the part preceding
+        the water logs (profile and other top-level fields), used after
+        records were updated or deleted.
         
         Args:
-            data_without_checksum: Data without checksum field.
+            payload: Canonical JSON bytes from _serialize.
             
         Returns:
             SHA-256 checksum string.
         """
-        data_str = json.dumps(data_without_checksum, sort_keys=True)
-        return hashlib.sha256(data_str.encode()).hexdigest()
+        view = memoryview(payload)
+        
+        if self._hash_tail and payload.startswith(self._hash_tail):
+            h = self._hash_tail_state.copy()
+            start = len(self._hash_tail)
+        else:
+            if not (self._hash_prefix and payload.startswith(self._hash_prefix)):
+                end = payload.find(b'"water_logs": ')
+                if end < 0:
+                    return hashlib.sha256(payload).hexdigest()
+                
+                self._hash_prefix = bytes(view[:end])
+                self._hash_prefix_state = hashlib.sha256(self._hash_prefix)
+            
+            h = self._hash_prefix_state.copy()
+            start = len(self._hash_prefix)
+        
+        # New records are inserted before the closing bracket of the list
+        cut = payload.rfind(b"]")
+        if cut > start:
+            h.update(view[start:cut])
+            self._hash_tail = bytes(view[:cut])
+            self._hash_tail_state = h.copy()
+            start = cut
+        
+        h.update(view[start:])
+        return h.hexdigest()
+    
+    def _build_document(self, payload: bytes, checksum: str) -> bytes:
+        """
+        Build file contents by adding checksum field to serialized data.
+        
+        "checksum" sorts before every other key, so the result is the same
+        document json.dumps would produce for data with checksum included.
+        
+        Args:
+            payload: Canonical JSON bytes of data without checksum field.
+            checksum: SHA-256 checksum of payload.
+            
+        Returns:
+            JSON document bytes.
+        """
+        header = b'{"checksum": "' + checksum.encode() + b'"'
+        if payload == b"{}":
+            return header + b"}"
+        return header + b", " + payload[1:]
     
     def _verify_checksum(self, data: Dict[str, Any]) -> bool:
         """
@@ -64,12 +339,44 @@ class DataStore:
             True if checksum matches, False otherwise.
         """
         expected_checksum = data.get("checksum", "")
-        data_copy = data.copy()
-        data_copy.pop("checksum", None)
-        actual_checksum = self._calculate_checksum(data_copy)
+        actual_checksum = self._calculate_checksum(self._serialize(data))
         
         return expected_checksum == actual_checksum
     
+    def _verify_document(self, raw: bytes, data: Dict[str, Any]) -> bool:
+        """
+        Verify checksum of a document read from file.
+        
+        Files written by _build_document are checked by hashing the raw
+        bytes after the checksum field, without re-serializing the data.
+        Other layouts (e.g. files written by older versions) fall back
+        to _verify_checksum.
+        
+        Args:
+            raw: File contents.
+            data: Data decoded from raw.
+            
+        Returns:
+            True if checksum matches, False otherwise.
+        """
+        expected_checksum = data.get("checksum", "")
+        header = b'{"checksum": "' + str(expected_checksum).encode() + b'"'
+        
+        if isinstance(expected_checksum, str) and expected_checksum and raw.startswith(header):
+            body = memoryview(raw)[len(header):]
+            if body == b"}":
+                h = hashlib.sha256(b"{}")
+            elif body[:2] == b", ":
+                h = hashlib.sha256(b"{")
+                h.update(body[2:])
+            else:
+                h = None
+            
+            if h is not None and h.hexdigest() == expected_checksum:
+                return True
+        
+        return self._verify_checksum(data)
+    
     def load(self) -> bool:
         """
         Load data from JSON file.
@@ -78,48 +385,308 @@ class DataStore:
             True if data loaded successfully, False otherwise.
         """
         try:
-            with open(self.file_path, 'r') as f:
-                loaded_data = json.load(f)
+            raw = _read_file(self.file_path)
+            loaded_data = _json_loads(raw)
             
             # Verify checksum
-            if not self._verify_checksum(loaded_data):
+            if not self._verify_document(raw, loaded_data):
                 logger.warning("Checksum mismatch.")
                 return False
             
+            self._wal_base = loaded_data.pop(WAL_SEQUENCE_KEY, 0)
             self.data = loaded_data
+            self.revision += 1
+            self._saved_checksum = loaded_data["checksum"]
             return True
         except (json.JSONDecodeError, FileNotFoundError) as e:
             logger.error(f"Error loading data: {e}")
             return False
     
-    def save(self) -> bool:
+    def save(self, durable: bool = False) -> bool:
         """
         Save data to JSON file.
         
+        In background mode data is serialized here and written by the
+        writer thread; use flush() to wait for the write.
+        
+        Args:
+            durable: Flush file to disk before returning.
+            
         Returns:
-            True if data saved successfully, False otherwise.
+            True if data saved (or queued for writing) successfully,
+            False otherwise.
         """
         try:
-            # Create data copy without checksum
-            data_copy = self.data.copy()
-            data_copy.pop("checksum", None)
+            # Writer thread may be discarding saved records meanwhile
+            with self._wal_lock:
+                wal_position = self._wal_base + len(self._wal_lines)
             
-            # Calculate new checksum
-            checksum = self._calculate_checksum(data_copy)
+            # File records which write-ahead log records it includes, so
+            # they are not applied again if the log outlives the file
+            data = self.data
+            if wal_position:
+                data = {**data, WAL_SEQUENCE_KEY: wal_position}
             
-            # Add checksum and save
+            # Serialize once, hash the same bytes
+            payload = self._serialize(data)
+            checksum = self._calculate_checksum(payload)
             self.data["checksum"] = checksum
             
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+            # File already holds exactly this data
+            if checksum == self._saved_checksum and not self._wal_lines:
+                self._dirty = False
+                return True
             
-            with open(self.file_path, 'w') as f:
-                json.dump(self.data, f, indent=2)
-                
+            # Ensure directory exists (once per store)
+            if not self._dir_ensured:
+                os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+                self._dir_ensured = True
+            
+            snapshot = (self._build_document(payload, checksum), wal_position, durable)
+            self._dirty = False
+            self._saved_checksum = checksum
+        except Exception as e:
+            logger.error(f"Error saving data: {e}")
+            return False
+        
+        if not self.background:
+            return self._write_snapshot(snapshot)
+        
+        # Hand over to writer thread, replacing a snapshot not yet written
+        with self._writer_cond:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+                self._writer.start()
+            self._pending = snapshot
+            self._writer_cond.notify()
+        return True
+    
+    def _write_snapshot(self, snapshot: Tuple[bytes, int, bool]) -> bool:
+        """
+        Write serialized data to JSON file.
+        
+        Args:
+            snapshot: File contents, sequence number of the last
+                write-ahead log record they include and durable flag,
+                as prepared by save().
+            
+        Returns:
+            True if data written successfully, False otherwise.
+        """
+        document, wal_position, durable = snapshot
+        try:
+            _write_file(self.file_path, document, durable)
+            
+            # Records in write-ahead log up to snapshot are now part of the file
+            self._discard_wal(wal_position)
             return True
         except Exception as e:
             logger.error(f"Error saving data: {e}")
+            self._dirty = True
+            self._saved_checksum = ""
+            return False
+    
+    def _writer_loop(self) -> None:
+        """Write snapshots queued by save() (background mode)."""
+        while True:
+            with self._writer_cond:
+                while self._pending is None:
+                    self._writer_cond.wait()
+                snapshot, self._pending = self._pending, None
+                self._writing = True
+            
+            result = self._write_snapshot(snapshot)
+            
+            with self._writer_cond:
+                self._writing = False
+                self._write_result = result
+                self._snapshot_queued = False
+                self._writer_cond.notify_all()
+    
+    def _append_wal(self, records: List[Dict[str, Any]]) -> bool:
+        """
+        Append records to write-ahead log.
+        
+        Each record is one JSON line, numbered by its "seq" field; all
+        records are written with a single system call.
+        
+        Args:
+            records: Write-ahead log records (see _apply_wal_record).
+            
+        Returns:
+            True if records appended successfully, False otherwise.
+        """
+        try:
+            with self._wal_lock:
+                sequence = self._wal_base + len(self._wal_lines)
+                lines = [
+                    _json_dumps({"seq": sequence + i, **record}) + b"\n"
+                    for i, record in enumerate(records, 1)
+                ]
+                
+                if self._wal_fd is None:
+                    self._wal_fd = os.open(self.wal_path, 
+                                           os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                
+                os.write(self._wal_fd, b"".join(lines))
+                self._wal_lines.extend(lines)
+            self._dirty = True
+            return True
+        except OSError as e:
+            logger.error(f"Error writing write-ahead log: {e}")
+            return False
+    
+    def _replay_wal(self) -> None:
+        """
+        Apply changes from write-ahead log to data.
+        
+        Records the loaded file already includes are skipped: the file is
+        replaced before saved records are removed from the log, so after a
+        crash in between the log still holds them. Replay stops at the first
+        damaged record; the log is then rewritten with the applied records
+        only, so records appended later do not follow unreadable bytes.
+        """
+        try:
+            raw = _read_file(self.wal_path)
+            for line in raw.splitlines():
+                try:
+                    record = _json_loads(line)
+                    sequence = record.pop("seq", None)
+                    if sequence is not None and sequence <= self._wal_base:
+                        continue
+                    
+                    self._apply_wal_record(record)
+                except json.JSONDecodeError:
+                    # Incomplete last record after a crash
+                    logger.warning("Skipping damaged write-ahead log record.")
+                    break
+                except (KeyError, IndexError, TypeError) as e:
+                    logger.warning(f"Skipping write-ahead log record not matching data: {e}")
+                    break
+                
+                self._wal_lines.append(bytes(line) + b"\n")
+            
+            # Drop skipped, damaged and unapplied records from the file
+            applied = b"".join(self._wal_lines)
+            if applied != raw:
+                if applied:
+                    _write_file(self.wal_path, applied)
+                else:
+                    os.remove(self.wal_path)
+        except OSError as e:
+            logger.error(f"Error reading write-ahead log: {e}")
+        
+        if self._wal_lines:
+            self._dirty = True
+    
+    def _apply_wal_record(self, record: Dict[str, Any]) -> None:
+        """
+        Apply one write-ahead log record to data.
+        
+        Added water logs are stored as the record dictionary itself;
+        other changes carry an "op" field.
+        Updates and deletes refer to records by index, so each record
+        must be applied only once; _replay_wal skips records the loaded
+        file already includes.
+        
+        Args:
+            record: Decoded write-ahead log record.
+        """
+        op = record.get("op")
+        log_dicts = self.data["water_logs"]
+        
+        if op is None:
+            log_dicts.append(record)
+        elif op == "update":
+            log_dicts[record["index"]] = record["log"]
+        elif op == "delete":
+            del log_dicts[record["index"]]
+        elif op == "profile":
+            self.data["profile"] = record["profile"]
+        else:
+            raise KeyError(f"unknown operation {op!r}")
+    
+    def _discard_wal(self, position: int) -> None:
+        """
+        Remove records saved to JSON file from write-ahead log.
+        
+        Records appended after the saved snapshot are kept.
+        
+        Args:
+            position: Sequence number of the last record included in the
+                saved file.
+        """
+        with self._wal_lock:
+            count = position - self._wal_base
+            if count <= 0:
+                return
+            
+            remaining = self._wal_lines[count:]
+            if remaining:
+                # Replace log file, so records are never missing from disk
+                _write_file(self.wal_path, b"".join(remaining))
+                if self._wal_fd is not None:
+                    os.close(self._wal_fd)
+                    self._wal_fd = None
+            elif self._wal_fd is not None:
+                os.ftruncate(self._wal_fd, 0)
+            elif os.path.exists(self.wal_path):
+                os.remove(self.wal_path)
+            
+            del self._wal_lines[:count]
+            self._wal_base = position
+    
+    def _commit(self, wal_records: List[Dict[str, Any]]) -> bool:
+        """
+        Persist a mutation of in-memory data.
+        
+        In write-back mode the mutation is appended to the write-ahead log
+        and data is written by flush(), or once the log grows past
+        WAL_SNAPSHOT_RECORDS records.
+        
+        Args:
+            wal_records: Write-ahead log records describing the mutation.
+            
+        Returns:
+            True if mutation committed successfully, False otherwise.
+        """
+        if not self.write_back:
+            return self.save()
+        
+        if not self._append_wal(wal_records):
             return False
+        
+        # Snapshot to keep the log (and replay on start) short; in background
+        # mode only one is queued until the writer thread has written it
+        if len(self._wal_lines) >= WAL_SNAPSHOT_RECORDS and not self._snapshot_queued:
+            self._snapshot_queued = self.background
+            if not self.save():
+                self._snapshot_queued = False
+        return True
+    
+    def flush(self, wait: bool = True) -> bool:
+        """
+        Write pending changes to JSON file.
+        
+        Args:
+            wait: In background mode, wait until the writer thread has
+                written them.
+        
+        Returns:
+            True if there was nothing to write or data saved successfully,
+            False otherwise.
+        """
+        if self._dirty and not self.save():
+            return False
+        
+        if not (self.background and wait):
+            return True
+        
+        # Wait for writer thread to write the last snapshot
+        with self._writer_cond:
+            while self._pending is not None or self._writing:
+                self._writer_cond.wait()
+            return self._write_result
     
     def export_data(self, export_path: str) -> bool:
         """
@@ -132,22 +699,62 @@ class DataStore:
             True if data exported successfully, False otherwise.
         """
         try:
-            # Create data copy
-            export_data = self.data.copy()
-            
-            # Add export metadata
-            export_data["export_date"] = time.time()
+            return self._write_export(export_path, self._build_export())
+        except Exception as e:
+            logger.error(f"Error exporting data: {e}")
+            return False
+    
+    def export_data_async(self, export_path: str) -> "Future[bool]":
+        """
+        Export data to JSON file, writing the file in a worker thread.
+        
+        Data is serialized before this method returns, so changes made
+        afterwards are not exported.
+        
+        Args:
+            export_path: Path to export file.
             
-            # Calculate new checksum
-            data_without_checksum = export_data.copy()
-            data_without_checksum.pop("checksum", None)
-            checksum = self._calculate_checksum(data_without_checksum)
-            export_data["checksum"] = checksum
+        Returns:
+            Future resolving to True if data exported successfully,
+            False otherwise.
+        """
+        try:
+            document = self._build_export()
+        except Exception as e:
+            logger.error(f"Error exporting data: {e}")
+            future: "Future[bool]" = Future()
+            future.set_result(False)
+            return future
+        
+        if self._export_executor is None:
+            self._export_executor = ThreadPoolExecutor(max_workers=1)
+        return self._export_executor.submit(self._write_export, export_path, document)
+    
+    def _build_export(self) -> bytes:
+        """
+        Serialize data with export metadata as a checksummed document.
+        
+        Returns:
+            JSON document bytes.
+        """
+        # Add export metadata and calculate new checksum
+        payload = self._serialize({**self.data, "export_date": time.time()})
+        checksum = self._calculate_checksum(payload)
+        return self._build_document(payload, checksum)
+    
+    def _write_export(self, export_path: str, document: bytes) -> bool:
+        """
+        Write export document to file.
+        
+        Args:
+            export_path: Path to export file.
+            document: JSON document bytes.
             
-            # Save to file
-            with open(export_path, 'w') as f:
-                json.dump(export_data, f, indent=2)
-                
+        Returns:
+            True if file written successfully, False otherwise.
+        """
+        try:
+            _write_file(export_path, document)
             return True
         except Exception as e:
             logger.error(f"Error exporting data: {e}")
@@ -164,16 +771,18 @@ class DataStore:
             True if data imported successfully, False otherwise.
         """
         try:
-            with open(import_path, 'r') as f:
-                import_data = json.load(f)
+            raw = _read_file(import_path)
+            import_data = _json_loads(raw)
             
             # Verify checksum
-            if not self._verify_checksum(import_data):
+            if not self._verify_document(raw, import_data):
                 logger.warning("Checksum mismatch.")
                 return False
             
-            # Update data
+            # Update data; sequence number belongs to the store that wrote the file
+            import_data.pop(WAL_SEQUENCE_KEY, None)
             self.data = import_data
+            self.revision += 1
             
             # Save updated data
             return self.save()
@@ -201,11 +810,24 @@ class DataStore:
             }
             
             self.data["profile"] = profile_dict
-            return self.save()
+            self._profile = profile
+            self._profile_dict = profile_dict
+            self.revision += 1
+            return self._commit([{"op": "profile", "profile": profile_dict}])
         except Exception as e:
             logger.error(f"Error saving profile: {e}")
             return False
     
+    def has_profile(self) -> bool:
+        """
+        Check if user profile exists.
+        
+        Returns:
+            True if profile exists, otherwise False.
+        """
+        # Also checks the profile is complete; cheap once it is cached
+        return self.load_profile() is not None
+    
     def load_profile(self) -> Optional[Profile]:
         """
         Load user profile.
@@ -216,14 +838,21 @@ class DataStore:
         profile_dict = self.data.get("profile")
         if not profile_dict:
             return None
+        
+        # Profile is immutable, so the same object (and its cached
+        # daily target) is reused until the profile data is replaced
+        if profile_dict is self._profile_dict:
+            return self._profile
             
         try:
-            return Profile(
+            self._profile = Profile(
                 height_cm=profile_dict["height_cm"],
                 weight_kg=profile_dict["weight_kg"],
                 age_years=profile_dict["age_years"],
                 gender=Gender[profile_dict["gender"]]
             )
+            self._profile_dict = profile_dict
+            return self._profile
         except (KeyError, ValueError) as e:
             logger.error(f"Error loading profile: {e}")
             return None
@@ -238,18 +867,45 @@ class DataStore:
         Returns:
             True if record added successfully, False otherwise.
         """
+        return self.add_water_logs([water_log])
+    
+    def add_water_logs(self, water_logs: List[WaterLog]) -> bool:
+        """
+        Add several water consumption records with a single write.
+        
+        Args:
+            water_logs: Water consumption record objects.
+            
+        Returns:
+            True if records added successfully, False otherwise.
+        """
         try:
-            # Convert record to dictionary
-            log_dict = {
-                "amount_ml": water_log.amount_ml,
-                "timestamp": water_log.timestamp,
-                "note": water_log.note
-            }
+            # Convert records to dictionaries
+            log_dicts = [
+                {
+                    "amount_ml": water_log.amount_ml,
+                    "timestamp": water_log.timestamp,
+                    "note": water_log.note
+                }
+                for water_log in water_logs
+            ]
             
-            self.data["water_logs"].append(log_dict)
-            return self.save()
+            timestamps = self._timestamp_column()
+            for log_dict in log_dicts:
+                if timestamps and log_dict["timestamp"] < timestamps[-1]:
+                    self._timestamps_sorted = False
+                
+                self.data["water_logs"].append(log_dict)
+                timestamps.append(log_dict["timestamp"])
+                if self._amount_sums is not None:
+                    self._amount_sums.append(self._amount_sums[-1] + log_dict["amount_ml"])
+                if self._encoded_logs is not None:
+                    self._encoded_logs.append(_canonical_json(log_dict))
+            
+            self.revision += 1
+            return self._commit(log_dicts)
         except Exception as e:
-            logger.error(f"Error adding water consumption record: {e}")
+            logger.error(f"Error adding water consumption records: {e}")
             return False
     
     def update_water_log(self, index: int, water_log: WaterLog) -> bool:
@@ -272,8 +928,18 @@ class DataStore:
                     "note": water_log.note
                 }
                 
+                timestamps = self._timestamp_column()
+                if ((index > 0 and water_log.timestamp < timestamps[index - 1]) or
+                    (index < len(timestamps) - 1 and water_log.timestamp > timestamps[index + 1])):
+                    self._timestamps_sorted = False
+                
+                timestamps[index] = water_log.timestamp
                 self.data["water_logs"][index] = log_dict
-                return self.save()
+                self._amount_sums = None
+                if self._encoded_logs is not None:
+                    self._encoded_logs[index] = _canonical_json(log_dict)
+                self.revision += 1
+                return self._commit([{"op": "update", "index": index, "log": log_dict}])
             else:
                 logger.warning(f"Error: Index {index} out of range.")
                 return False
@@ -293,8 +959,13 @@ class DataStore:
         """
         try:
             if 0 <= index < len(self.data["water_logs"]):
+                del self._timestamp_column()[index]
                 del self.data["water_logs"][index]
-                return self.save()
+                self._amount_sums = None
+                if self._encoded_logs is not None:
+                    del self._encoded_logs[index]
+                self.revision += 1
+                return self._commit([{"op": "delete", "index": index}])
             else:
                 logger.warning(f"Error: Index {index} out of range.")
                 return False
@@ -302,6 +973,36 @@ class DataStore:
             logger.error(f"Error deleting water consumption record: {e}")
             return False
     
+    def count_water_logs(self) -> int:
+        """
+        Get number of water consumption records.
+        
+        Returns:
+            Number of records.
+        """
+        return len(self.data.get("water_logs", []))
+    
+    def get_water_log(self, index: int) -> Optional[WaterLog]:
+        """
+        Get water consumption record by index.
+        
+        Args:
+            index: Record index.
+            
+        Returns:
+            Record object or None if index is out of range.
+        """
+        log_dicts = self.data.get("water_logs", [])
+        if not 0 <= index < len(log_dicts):
+            return None
+        
+        log_dict = log_dicts[index]
+        return WaterLog(
+            amount_ml=log_dict.get("amount_ml", 0),
+            timestamp=self._timestamp_column()[index],
+            note=log_dict.get("note")
+        )
+    
     def get_water_logs(self, start_time: Optional[float] = None, 
                       end_time: Optional[float] = None) -> List[Tuple[int, WaterLog]]:
         """
@@ -314,24 +1015,150 @@ class DataStore:
         Returns:
             List of tuples (index, record) for water consumption.
         """
-        logs = []
+        return list(self.iter_water_logs(start_time, end_time))
+    
+    def iter_water_logs(self, start_time: Optional[float] = None, 
+                        end_time: Optional[float] = None) -> Iterator[Tuple[int, WaterLog]]:
+        """
+        Iterate over water consumption records for specified period.
+        
+        Record objects are built only as the caller consumes them, so
+        stopping early costs nothing for the remaining records. Records
+        must not be added or deleted during iteration.
+        
+        Args:
+            start_time: Period start (Unix timestamp).
+            end_time: Period end (Unix timestamp).
+            
+        Yields:
+            Tuples (index, record) for water consumption.
+        """
+        log_dicts = self.data.get("water_logs", [])
+        timestamps = self._timestamp_column()
+        
+        for i in self._indices_in_range(start_time, end_time):
+            log_dict = log_dicts[i]
+            yield i, WaterLog(
+                amount_ml=log_dict.get("amount_ml", 0),
+                timestamp=timestamps[i],
+                note=log_dict.get("note")
+            )
+    
+    def get_latest_water_logs(self, limit: int, start_time: Optional[float] = None,
+                              end_time: Optional[float] = None) -> List[Tuple[int, WaterLog]]:
+        """
+        Get newest water consumption records in specified period.
         
-        for i, log_dict in enumerate(self.data.get("water_logs", [])):
-            timestamp = log_dict.get("timestamp", 0)
+        Args:
+            limit: Maximum number of records.
+            start_time: Period start (Unix timestamp).
+            end_time: Period end (Unix timestamp).
             
-            # Verify if record is in specified period
-            if ((start_time is None or timestamp >= start_time) and 
-                (end_time is None or timestamp <= end_time)):
-                
-                log = WaterLog(
-                    amount_ml=log_dict.get("amount_ml", 0),
-                    timestamp=timestamp,
-                    note=log_dict.get("note")
-                )
-                
-                logs.append((i, log))
+        Returns:
+            List of tuples (index, record), newest first.
+        """
+        if limit <= 0:
+            return []
+        
+        indices = self._indices_in_range(start_time, end_time)
+        if isinstance(indices, range):
+            latest = reversed(indices[-limit:])
+        else:
+            latest = heapq.nlargest(limit, indices, key=self._timestamp_column().__getitem__)
+        
+        return [(i, self.get_water_log(i)) for i in latest]
+    
+    def get_total_amount(self, start_time: Optional[float] = None,
+                         end_time: Optional[float] = None) -> int:
+        """
+        Get total amount of water consumed in specified period.
+        
+        Args:
+            start_time: Period start (Unix timestamp).
+            end_time: Period end (Unix timestamp).
+            
+        Returns:
+            Total amount in milliliters.
+        """
+        indices = self._indices_in_range(start_time, end_time)
+        log_dicts = self.data.get("water_logs", [])
+        
+        if not isinstance(indices, range):
+            return sum(log_dicts[i].get("amount_ml", 0) for i in indices)
+        
+        # Contiguous records: difference of running totals
+        if self._amount_sums is None:
+            self._amount_sums = [0]
+            for log_dict in log_dicts:
+                self._amount_sums.append(self._amount_sums[-1] + log_dict.get("amount_ml", 0))
+        
+        return self._amount_sums[indices.stop] - self._amount_sums[indices.start]
+    
+    def get_next_timestamp(self, after_time: float) -> Optional[float]:
+        """
+        Get earliest record timestamp later than specified time.
+        
+        Args:
+            after_time: Time (Unix timestamp), exclusive.
+            
+        Returns:
+            Timestamp or None if no record is later.
+        """
+        timestamps = self._timestamp_column()
+        
+        if self._timestamps_sorted:
+            i = bisect.bisect_right(timestamps, after_time)
+            return timestamps[i] if i < len(timestamps) else None
+        
+        return min((timestamp for timestamp in timestamps if timestamp > after_time), default=None)
+    
+    def _indices_in_range(self, start_time: Optional[float],
+                          end_time: Optional[float]) -> Iterable[int]:
+        """
+        Get indices of records with timestamp in specified period.
+        
+        Records are normally added in time order, so the period is found
+        by binary search. Falls back to a linear scan if timestamps are
+        out of order (e.g. imported or edited data).
+        
+        Args:
+            start_time: Period start (Unix timestamp), inclusive.
+            end_time: Period end (Unix timestamp), inclusive.
+            
+        Returns:
+            Record indices in ascending order.
+        """
+        timestamps = self._timestamp_column()
+        
+        if self._timestamps_sorted:
+            lo = 0 if start_time is None else bisect.bisect_left(timestamps, start_time)
+            hi = len(timestamps) if end_time is None else bisect.bisect_right(timestamps, end_time)
+            return range(lo, hi)
         
-        return logs
+        lower = -math.inf if start_time is None else start_time
+        upper = math.inf if end_time is None else end_time
+        return [i for i, timestamp in enumerate(timestamps) if lower <= timestamp <= upper]
+    
+    def _timestamp_column(self) -> List[float]:
+        """
+        Get timestamps of all water consumption records.
+        
+        The column is kept in sync by add/update/delete and rebuilt when
+        the records list was replaced (load, import, clear) or resized
+        outside this class.
+        
+        Returns:
+            List of timestamps in record order.
+        """
+        log_dicts = self.data.get("water_logs", [])
+        if self._indexed_logs is not log_dicts or len(self._timestamps) != len(log_dicts):
+            self._timestamps = [log_dict.get("timestamp", 0) for log_dict in log_dicts]
+            self._timestamps_sorted = all(a <= b for a, b in zip(self._timestamps, 
+                                                                 self._timestamps[1:]))
+            self._indexed_logs = log_dicts
+            self._amount_sums = None
+            self._encoded_logs = None
+        return self._timestamps
     
     def clear_all_data(self) -> bool:
         """
@@ -347,6 +1174,7 @@ class DataStore:
                 "water_logs": [],
                 "checksum": ""
             }
+            self.revision += 1
             
             # Save updated data
             return self.save()
@@ -2,10 +2,17 @@
 Service for working with user profile.
 """
 
+import math
+
 from model.profile import Profile, Gender
 from repository.data_store import DataStore
 
 
+# Genders by name and their list for error messages
+_GENDERS = {g.name: g for g in Gender}
+_GENDER_NAMES = ", ".join(_GENDERS)
+
+
 class ProfileService:
     """Service for working with user profile."""
     
@@ -44,18 +51,17 @@ class ProfileService:
         Raises:
             ValueError: If input data is invalid.
         """
-        # Input data validation
-        if height_cm <= 0:
+        # Input data validation (NaN and infinity pass comparisons with 0)
+        if not math.isfinite(height_cm) or height_cm <= 0:
             raise ValueError("Height must be greater than 0 cm.")
-        if weight_kg <= 0:
+        if not math.isfinite(weight_kg) or weight_kg <= 0:
             raise ValueError("Weight must be greater than 0 kg.")
-        if age_years <= 0:
+        if not math.isfinite(age_years) or age_years <= 0:
             raise ValueError("Age must be greater than 0 years.")
         
-        try:
-            gender_enum = Gender[gender.upper()]
-        except (KeyError, AttributeError):
-            raise ValueError(f"Invalid gender. Must be one of: {', '.join([g.name for g in Gender])}.")
+        gender_enum = _GENDERS.get(gender.upper()) if isinstance(gender, str) else None
+        if gender_enum is None:
+            raise ValueError(f"Invalid gender. Must be one of: {_GENDER_NAMES}.")
         
         # Create profile
         profile = Profile(
@@ -65,8 +71,8 @@ class ProfileService:
             gender=gender_enum
         )
         
-        # Save profile
-        if not self.data_store.save_profile(profile):
+        # Save profile and write it to disk right away
+        if not self.data_store.save_profile(profile) or not self.data_store.flush():
             raise RuntimeError("Failed to save profile.")
         
         return profile
@@ -98,7 +104,7 @@ class ProfileService:
         Returns:
             True if profile exists, otherwise False.
         """
-        return self.data_store.load_profile() is not None
+        return self.data_store.has_profile()
     
     def get_daily_target(self) -> int:
         """
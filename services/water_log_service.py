@@ -2,6 +2,7 @@
 Service for managing water consumption records.
 """
 
+import math
 import time
 from typing import List, Tuple, Optional
 from datetime import datetime, timedelta
@@ -78,11 +79,7 @@ class WaterLogService:
             raise ValueError("Amount must be greater than 0 ml.")
         
         # Retrieve current record
-        logs = self.data_store.get_water_logs()
-        if index < 0 or index >= len(logs):
-            raise IndexError(f"Log index {index} out of range.")
-        
-        _, current_log = logs[index]
+        current_log = self.get_water_log(index)
         
         # Create updated record
         updated_log = WaterLog(
@@ -108,14 +105,32 @@ class WaterLogService:
             IndexError: If index is out of range.
         """
         # Check if record exists
-        logs = self.data_store.get_water_logs()
-        if index < 0 or index >= len(logs):
+        if index < 0 or index >= self.data_store.count_water_logs():
             raise IndexError(f"Log index {index} out of range.")
         
         # Delete record
         if not self.data_store.delete_water_log(index):
             raise RuntimeError("Failed to delete water log.")
     
+    def get_water_log(self, index: int) -> WaterLog:
+        """
+        Retrieves a single water consumption record.
+        
+        Args:
+            index: Record index.
+            
+        Returns:
+            Water log object.
+            
+        Raises:
+            IndexError: If index is out of range.
+        """
+        water_log = self.data_store.get_water_log(index)
+        if water_log is None:
+            raise IndexError(f"Log index {index} out of range.")
+        
+        return water_log
+    
     def get_water_logs(self, days: int = 1) -> List[Tuple[int, WaterLog]]:
         """
         Retrieves a list of water consumption records for the specified period.
@@ -133,27 +148,81 @@ class WaterLogService:
         # Retrieve records
         return self.data_store.get_water_logs(start_time, end_time)
     
+    def get_recent_water_logs(self, limit: int = 10, 
+                              days: int = 1) -> List[Tuple[int, WaterLog]]:
+        """
+        Retrieves the newest water consumption records for the specified period.
+        
+        Args:
+            limit: Maximum number of records (default is 10).
+            days: Number of days to retrieve (default is 1 day).
+            
+        Returns:
+            List of tuples (index, water log), newest first.
+        """
+        end_time = time.time()
+        start_time = end_time - (days * 24 * 60 * 60)
+        
+        return self.data_store.get_latest_water_logs(limit, start_time, end_time)
+    
     def get_water_logs_by_range(self, start_date: datetime, 
                                end_date: datetime) -> List[Tuple[int, WaterLog]]:
         """
         Retrieves a list of water consumption records for the specified date range.
         
+        Dates are in local time, matching how records are displayed.
+        
         Args:
             start_date: Start date.
-            end_date: End date.
+            end_date: End date (inclusive).
             
         Returns:
             List of tuples (index, water log) of water consumption records.
         """
-        # Convert dates to Unix timestamp
+        start_time, end_time = self._range_bounds(start_date, end_date)
+        
+        # Retrieve records
+        return self.data_store.get_water_logs(start_time, end_time)
+    
+    def get_total_amount_by_range(self, start_date: datetime, end_date: datetime) -> int:
+        """
+        Calculates total water consumption for the specified date range.
+        
+        Args:
+            start_date: Start date.
+            end_date: End date (inclusive).
+            
+        Returns:
+            Amount of water consumed in milliliters.
+        """
+        start_time, end_time = self._range_bounds(start_date, end_date)
+        return self.data_store.get_total_amount(start_time, end_time)
+    
+    def _range_bounds(self, start_date: datetime, 
+                      end_date: datetime) -> Tuple[float, float]:
+        """
+        Converts a local date range to Unix timestamps.
+        
+        Args:
+            start_date: Start date.
+            end_date: End date (inclusive).
+            
+        Returns:
+            Tuple (start timestamp, end timestamp).
+        """
         # Add 1 day to the end date to include it in the range
         end_date = end_date + timedelta(days=1)
         
-        start_time = start_date.timestamp()
-        end_time = end_date.timestamp()
+        return start_date.timestamp(), end_date.timestamp()
+    
+    def get_data_revision(self) -> int:
+        """
+        Retrieves the revision of stored data.
         
-        # Retrieve records
-        return self.data_store.get_water_logs(start_time, end_time)
+        Returns:
+            Number that changes whenever records or profile change.
+        """
+        return self.data_store.revision
     
     def get_daily_consumption(self) -> int:
         """
@@ -162,11 +231,35 @@ class WaterLogService:
         Returns:
             Amount of water consumed in milliliters.
         """
-        # Retrieve records for the current day
-        logs = self.get_water_logs(days=1)
+        # Sum the amount of water for the current day
+        end_time = time.time()
+        start_time = end_time - (24 * 60 * 60)
+        return self.data_store.get_total_amount(start_time, end_time)
+    
+    def get_daily_stats_expiry(self) -> float:
+        """
+        Retrieves the time until which current-day statistics stay valid.
+        
+        Statistics cover the last 24 hours, so while records are unchanged
+        they change only when the oldest record of the period leaves it or
+        a record with a later timestamp enters it.
+        
+        Returns:
+            Unix timestamp, or infinity if no record will leave or enter
+            the period.
+        """
+        end_time = time.time()
+        start_time = end_time - (24 * 60 * 60)
+        
+        oldest = self.data_store.get_next_timestamp(start_time)
+        if oldest is None:
+            return math.inf
+        if oldest > end_time:
+            return oldest
         
-        # Sum the amount of water
-        return sum(log.amount_ml for _, log in logs)
+        upcoming = self.data_store.get_next_timestamp(end_time)
+        expiry = oldest + (24 * 60 * 60)
+        return expiry if upcoming is None else min(expiry, upcoming)
     
     def get_progress_percentage(self) -> float:
         """
@@ -175,15 +268,24 @@ class WaterLogService:
         Returns:
             Percentage of target achieved (from 0.0 to 1.0).
         """
-        # Retrieve daily water target
-        daily_target = self.profile_service.get_daily_target()
+        _, progress, _ = self.get_daily_stats(self.profile_service.get_daily_target())
+        return progress
+    
+    def get_daily_stats(self, daily_target: int) -> Tuple[int, float, int]:
+        """
+        Calculates water consumption statistics for the current day.
+        
+        Args:
+            daily_target: Daily water target in milliliters.
+            
+        Returns:
+            Tuple (consumed ml, percentage of target achieved from 0.0 to 1.0,
+            remaining ml).
+        """
+        consumed = self.get_daily_consumption()
         
         # If profile is missing or target is 0
         if daily_target == 0:
-            return 0.0
-        
-        # Retrieve current consumption
-        current_consumption = self.get_daily_consumption()
+            return consumed, 0.0, 0
         
-        # Calculate percentage
-        return min(1.0, current_consumption / daily_target) 
\ No newline at end of file
+        return consumed, min(1.0, consumed / daily_target), max(0, daily_target - consumed)
@@ -1,4 +1,5 @@
 
+import atexit
 import os
 import json
 import tempfile
@@ -13,6 +14,10 @@ def temp_data_file():
     os.close(fd)
     yield path
     os.unlink(path)
+    
+    wal_path = os.path.splitext(path)[0] + ".wal"
+    if os.path.exists(wal_path):
+        os.unlink(wal_path)
 
 
 def test_init_data_store():
@@ -80,7 +85,9 @@ def test_profile_operations(temp_data_file):
         gender=Gender.MALE
     )
     
+    assert data_store.has_profile() is False
     assert data_store.save_profile(profile) is True
+    assert data_store.has_profile() is True
     
     loaded_profile = data_store.load_profile()
     assert loaded_profile is not None
@@ -155,4 +162,505 @@ def test_get_water_logs_by_period(temp_data_file):
     
     # Get logs only to end date
     logs = data_store.get_water_logs(end_time=1622635200.0)
-    assert len(logs) == 2 
\ No newline at end of file
+    assert len(logs) == 2 
+
+def test_saved_checksum_matches_file_contents(temp_data_file):
+    """Test saved file checksum is computed over the written data."""
+    import hashlib
+    
+    data_store = DataStore(temp_data_file)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0, note="Ранок"))
+    
+    with open(temp_data_file, 'r') as f:
+        data = json.load(f)
+    
+    checksum = data.pop("checksum")
+    expected = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    assert checksum == expected
+
+
+def test_checksum_after_sequence_of_changes(temp_data_file):
+    """Test cached hash states give full checksums after every change."""
+    import hashlib
+    
+    data_store = DataStore(temp_data_file)
+    changes = [
+        lambda: data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0)),
+        lambda: data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622552400.0, note="]")),
+        lambda: data_store.save_profile(Profile(180, 80.0, 30, Gender.MALE)),
+        lambda: data_store.add_water_log(WaterLog(amount_ml=200, timestamp=1622556000.0)),
+        lambda: data_store.update_water_log(0, WaterLog(amount_ml=100, timestamp=1622548800.0)),
+        lambda: data_store.delete_water_log(2),
+        lambda: data_store.add_water_log(WaterLog(amount_ml=150, timestamp=1622559600.0)),
+    ]
+    
+    for change in changes:
+        assert change() is True
+        
+        with open(temp_data_file, 'r') as f:
+            data = json.load(f)
+        
+        checksum = data.pop("checksum")
+        assert checksum == hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+        assert data == {key: value for key, value in data_store.data.items() if key != "checksum"}
+
+
+def test_load_non_finite_numbers(temp_data_file):
+    """Test files with NaN or Infinity written by the store load again."""
+    import math
+    
+    data_store = DataStore(temp_data_file)
+    data_store.data["profile"] = {"height_cm": 180, "weight_kg": float("nan"),
+                                  "age_years": 30, "gender": "MALE"}
+    data_store.data["water_logs"] = [{"amount_ml": 250, "timestamp": float("inf"), "note": None}]
+    assert data_store.save() is True
+    
+    data_store2 = DataStore(temp_data_file)
+    assert math.isnan(data_store2.data["profile"]["weight_kg"])
+    assert data_store2.data["water_logs"][0]["timestamp"] == math.inf
+
+
+def test_write_back_flush(temp_data_file):
+    """Test write-back mode keeps changes in memory until flush."""
+    data_store = DataStore(temp_data_file, write_back=True)
+    assert data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0)) is True
+    
+    # Nothing written yet
+    assert os.path.getsize(temp_data_file) == 0
+    
+    assert data_store.flush() is True
+    
+    data_store2 = DataStore(temp_data_file)
+    assert len(data_store2.get_water_logs()) == 1
+
+
+def test_write_back_wal_replay(temp_data_file):
+    """Test water logs added in write-back mode are recovered without flush."""
+    data_store = DataStore(temp_data_file, write_back=True)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0, note="Morning"))
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622552400.0))
+    
+    # Simulate a crash: the first store is never flushed
+    atexit.unregister(data_store.flush)
+    
+    data_store2 = DataStore(temp_data_file)
+    logs = data_store2.get_water_logs()
+    assert [log.amount_ml for _, log in logs] == [250, 300]
+    assert logs[0][1].note == "Morning"
+    
+    # Saving moves records from write-ahead log into the file
+    assert data_store2.save() is True
+    assert not os.path.exists(data_store2.wal_path)
+
+
+def test_write_back_keeps_file_that_failed_to_load(temp_data_file):
+    """Test a file that fails to load is not replaced by flushes."""
+    data_store = DataStore(temp_data_file, write_back=True)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    assert data_store.flush() is True
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622552400.0))
+    atexit.unregister(data_store.flush)
+    
+    # Damage the file: checksum no longer matches
+    with open(temp_data_file, 'rb') as f:
+        damaged = f.read().replace(b'"amount_ml": 250', b'"amount_ml": 251')
+    with open(temp_data_file, 'wb') as f:
+        f.write(damaged)
+    with open(data_store.wal_path, 'rb') as f:
+        wal = f.read()
+    
+    data_store2 = DataStore(temp_data_file, write_back=True)
+    assert data_store2.get_water_logs() == []
+    assert data_store2.flush() is True
+    atexit.unregister(data_store2.flush)
+    
+    with open(temp_data_file, 'rb') as f:
+        assert f.read() == damaged
+    with open(data_store2.wal_path, 'rb') as f:
+        assert f.read() == wal
+
+
+def test_write_back_crash_before_wal_discard(temp_data_file, monkeypatch):
+    """Test records saved to file are not replayed again from write-ahead log."""
+    data_store = DataStore(temp_data_file, write_back=True)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622552400.0))
+    
+    # Simulate a crash after the file was replaced, before the log was truncated
+    monkeypatch.setattr(data_store, "_discard_wal", lambda position: None)
+    assert data_store.save() is True
+    atexit.unregister(data_store.flush)
+    
+    data_store2 = DataStore(temp_data_file, write_back=True)
+    assert [log.amount_ml for _, log in data_store2.get_water_logs()] == [250, 300]
+    
+    # Numbering continues after the skipped records
+    data_store2.add_water_log(WaterLog(amount_ml=350, timestamp=1622556000.0))
+    atexit.unregister(data_store2.flush)
+    
+    logs = DataStore(temp_data_file).get_water_logs()
+    assert [log.amount_ml for _, log in logs] == [250, 300, 350]
+
+
+def test_write_back_append_after_damaged_record(temp_data_file):
+    """Test records added after replay stopped at a damaged record survive."""
+    data_store = DataStore(temp_data_file, write_back=True)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622552400.0))
+    atexit.unregister(data_store.flush)
+    
+    # Simulate a crash in the middle of writing a record
+    with open(data_store.wal_path, 'ab') as f:
+        f.write(b'{"seq": 3, "amount')
+    
+    data_store2 = DataStore(temp_data_file, write_back=True)
+    assert [log.amount_ml for _, log in data_store2.get_water_logs()] == [250, 300]
+    data_store2.add_water_log(WaterLog(amount_ml=400, timestamp=1622556000.0))
+    data_store2.add_water_log(WaterLog(amount_ml=500, timestamp=1622559600.0))
+    atexit.unregister(data_store2.flush)
+    
+    logs = DataStore(temp_data_file).get_water_logs()
+    assert [log.amount_ml for _, log in logs] == [250, 300, 400, 500]
+
+
+def test_get_water_logs_unsorted(temp_data_file):
+    """Test period filtering when records are not in time order."""
+    data_store = DataStore(temp_data_file)
+    
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622635200.0))
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    data_store.add_water_log(WaterLog(amount_ml=350, timestamp=1622721600.0))
+    
+    logs = data_store.get_water_logs(start_time=1622548800.0, end_time=1622635200.0)
+    assert [index for index, _ in logs] == [0, 1]
+    
+    assert data_store.get_total_amount() == 900
+    assert data_store.get_total_amount(start_time=1622635200.0) == 650
+
+
+def test_has_profile_rejects_incomplete_profile(temp_data_file):
+    """Test an incomplete profile is reported as missing."""
+    data_store = DataStore(temp_data_file)
+    data_store.data["profile"] = {"height_cm": 180}
+    assert data_store.has_profile() is False
+    
+    data_store.save_profile(Profile(180, 80.0, 30, Gender.MALE))
+    assert data_store.has_profile() is True
+
+
+def test_load_profile_reuses_object(temp_data_file):
+    """Test that loaded profile is reused until it is replaced."""
+    data_store = DataStore(temp_data_file)
+    data_store.save_profile(Profile(180, 80.0, 30, Gender.MALE))
+    
+    profile = data_store.load_profile()
+    assert data_store.load_profile() is profile
+    
+    data_store.save_profile(Profile(170, 70.0, 25, Gender.FEMALE))
+    assert data_store.load_profile().height_cm == 170
+
+
+def test_save_leaves_no_temp_file(temp_data_file):
+    """Test that saving replaces the file without leaving a temp file."""
+    data_store = DataStore(temp_data_file)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    
+    assert data_store.save(durable=True) is True
+    assert not os.path.exists(f"{temp_data_file}.tmp")
+    assert len(DataStore(temp_data_file).data["water_logs"]) == 1
+
+
+def test_load_verifies_other_layouts(temp_data_file):
+    """Test that files not written by save() are verified by contents."""
+    data_store = DataStore(temp_data_file)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    
+    with open(temp_data_file, 'r') as f:
+        data = json.load(f)
+    
+    # Same data, reformatted
+    with open(temp_data_file, 'w') as f:
+        json.dump(data, f, indent=2)
+    assert DataStore(temp_data_file).load() is True
+    
+    # Changed data, original checksum
+    data["water_logs"][0]["amount_ml"] = 500
+    with open(temp_data_file, 'w') as f:
+        json.dump(data, f)
+    assert DataStore(temp_data_file).load() is False
+
+
+def test_add_water_logs_bulk(temp_data_file):
+    """Test adding several water logs at once."""
+    data_store = DataStore(temp_data_file)
+    
+    assert data_store.add_water_logs([
+        WaterLog(amount_ml=250, timestamp=1622548800.0),
+        WaterLog(amount_ml=300, timestamp=1622552400.0, note="Lunch")
+    ]) is True
+    
+    logs = DataStore(temp_data_file).get_water_logs()
+    assert [log.amount_ml for _, log in logs] == [250, 300]
+    assert logs[1][1].note == "Lunch"
+
+
+def test_background_save(temp_data_file):
+    """Test background mode writes data from writer thread."""
+    data_store = DataStore(temp_data_file, write_back=True, background=True)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    
+    assert data_store.flush() is True
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622552400.0))
+    
+    # Only the record added after the save is left in write-ahead log
+    data_store2 = DataStore(temp_data_file)
+    assert [log.amount_ml for _, log in data_store2.get_water_logs()] == [250, 300]
+    
+    assert data_store.flush() is True
+    assert os.path.getsize(data_store.wal_path) == 0
+    assert len(DataStore(temp_data_file).get_water_logs()) == 2
+
+
+def test_get_water_log_by_index(temp_data_file):
+    """Test getting a single water log by index."""
+    data_store = DataStore(temp_data_file)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0, note="Morning"))
+    
+    assert data_store.count_water_logs() == 1
+    assert data_store.get_water_log(0) == WaterLog(amount_ml=250, timestamp=1622548800.0, note="Morning")
+    assert data_store.get_water_log(1) is None
+    assert data_store.get_water_log(-1) is None
+
+
+def test_get_total_amount_after_changes(temp_data_file):
+    """Test period totals stay correct after records change."""
+    data_store = DataStore(temp_data_file)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622552400.0))
+    assert data_store.get_total_amount(start_time=1622550000.0) == 300
+    
+    data_store.add_water_log(WaterLog(amount_ml=200, timestamp=1622556000.0))
+    assert data_store.get_total_amount(start_time=1622550000.0) == 500
+    
+    data_store.update_water_log(1, WaterLog(amount_ml=400, timestamp=1622552400.0))
+    assert data_store.get_total_amount() == 850
+    
+    data_store.delete_water_log(0)
+    assert data_store.get_total_amount() == 600
+
+
+def test_save_skips_unchanged_data(temp_data_file):
+    """Test that saving unchanged data does not rewrite the file."""
+    data_store = DataStore(temp_data_file)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    
+    mtime = os.stat(temp_data_file).st_mtime_ns
+    os.utime(temp_data_file, ns=(mtime - 10**9, mtime - 10**9))
+    
+    assert data_store.update_water_log(0, WaterLog(amount_ml=250, timestamp=1622548800.0)) is True
+    assert DataStore(temp_data_file).save() is True
+    assert os.stat(temp_data_file).st_mtime_ns == mtime - 10**9
+    
+    assert data_store.update_water_log(0, WaterLog(amount_ml=300, timestamp=1622548800.0)) is True
+    assert os.stat(temp_data_file).st_mtime_ns != mtime - 10**9
+
+
+def test_write_back_delete_of_unsaved_log(temp_data_file):
+    """Test a record added and deleted before flush does not come back."""
+    data_store = DataStore(temp_data_file)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    
+    data_store = DataStore(temp_data_file, write_back=True)
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622552400.0))
+    data_store.delete_water_log(1)
+    assert data_store.flush() is True
+    
+    assert len(DataStore(temp_data_file).get_water_logs()) == 1
+
+
+def test_write_back_wal_replays_all_changes(temp_data_file):
+    """Test updates, deletes and profile in write-back mode survive a crash."""
+    data_store = DataStore(temp_data_file)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622552400.0))
+    
+    data_store = DataStore(temp_data_file, write_back=True)
+    data_store.update_water_log(0, WaterLog(amount_ml=200, timestamp=1622548800.0, note="Edited"))
+    data_store.delete_water_log(1)
+    data_store.add_water_log(WaterLog(amount_ml=350, timestamp=1622556000.0))
+    data_store.save_profile(Profile(170, 70.0, 25, Gender.FEMALE))
+    
+    # Simulate a crash: the store is never flushed
+    atexit.unregister(data_store.flush)
+    
+    data_store2 = DataStore(temp_data_file)
+    logs = data_store2.get_water_logs()
+    assert [(log.amount_ml, log.note) for _, log in logs] == [(200, "Edited"), (350, None)]
+    assert data_store2.load_profile().gender == Gender.FEMALE
+
+
+def test_write_back_replay_skips_saved_delete(temp_data_file, monkeypatch):
+    """Test index-based changes already in the saved file are not applied again."""
+    data_store = DataStore(temp_data_file)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622552400.0))
+    data_store.add_water_log(WaterLog(amount_ml=350, timestamp=1622556000.0))
+    
+    data_store = DataStore(temp_data_file, write_back=True)
+    data_store.update_water_log(1, WaterLog(amount_ml=200, timestamp=1622552400.0))
+    data_store.delete_water_log(0)
+    
+    # Simulate a crash after the file was replaced, before the log was truncated
+    monkeypatch.setattr(data_store, "_discard_wal", lambda position: None)
+    assert data_store.save() is True
+    atexit.unregister(data_store.flush)
+    
+    logs = DataStore(temp_data_file).get_water_logs()
+    assert [log.amount_ml for _, log in logs] == [200, 350]
+
+
+def test_write_back_append_after_unmatched_record(temp_data_file):
+    """Test numbering after replay stopped at a record not matching data."""
+    data_store = DataStore(temp_data_file, write_back=True)
+    with open(data_store.wal_path, 'wb') as f:
+        f.write(b'{"seq": 1, "amount_ml": 250, "timestamp": 1622548800.0, "note": null}\n'
+                b'{"seq": 2, "op": "delete", "index": 5}\n'
+                b'{"seq": 3, "amount_ml": 300, "timestamp": 1622552400.0, "note": null}\n')
+    atexit.unregister(data_store.flush)
+    
+    data_store2 = DataStore(temp_data_file, write_back=True)
+    assert [log.amount_ml for _, log in data_store2.get_water_logs()] == [250]
+    data_store2.add_water_log(WaterLog(amount_ml=400, timestamp=1622556000.0))
+    atexit.unregister(data_store2.flush)
+    
+    logs = DataStore(temp_data_file).get_water_logs()
+    assert [log.amount_ml for _, log in logs] == [250, 400]
+
+
+def test_write_back_snapshot_threshold(temp_data_file, monkeypatch):
+    """Test write-back mode saves a snapshot once the log is long enough."""
+    import repository.data_store
+    monkeypatch.setattr(repository.data_store, "WAL_SNAPSHOT_RECORDS", 2)
+    
+    data_store = DataStore(temp_data_file, write_back=True)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    assert os.path.getsize(temp_data_file) == 0
+    
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622552400.0))
+    assert os.path.getsize(data_store.wal_path) == 0
+    assert len(DataStore(temp_data_file).get_water_logs()) == 2
+
+
+def test_background_snapshot_threshold_queues_once(temp_data_file, monkeypatch):
+    """Test a burst of changes queues one snapshot while the writer is busy."""
+    import threading
+    import repository.data_store
+    monkeypatch.setattr(repository.data_store, "WAL_SNAPSHOT_RECORDS", 2)
+    
+    data_store = DataStore(temp_data_file, write_back=True, background=True)
+    release = threading.Event()
+    write_snapshot = data_store._write_snapshot
+    
+    def blocked_write_snapshot(snapshot):
+        release.wait()
+        return write_snapshot(snapshot)
+    
+    monkeypatch.setattr(data_store, "_write_snapshot", blocked_write_snapshot)
+    
+    saves = []
+    save = data_store.save
+    monkeypatch.setattr(data_store, "save", lambda: saves.append(1) or save())
+    
+    try:
+        for i in range(6):
+            data_store.add_water_log(WaterLog(amount_ml=100 + i, timestamp=1622548800.0 + i))
+        assert len(saves) == 1
+    finally:
+        release.set()
+    
+    assert data_store.flush() is True
+    assert len(DataStore(temp_data_file).get_water_logs()) == 6
+
+
+def test_background_flush_without_wait(temp_data_file):
+    """Test flush can hand data to the writer thread without waiting."""
+    data_store = DataStore(temp_data_file, write_back=True, background=True)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    
+    assert data_store.flush(wait=False) is True
+    assert data_store.flush() is True
+    assert len(DataStore(temp_data_file).get_water_logs()) == 1
+
+
+def test_iter_water_logs(temp_data_file):
+    """Test lazy iteration over water logs in a period."""
+    data_store = DataStore(temp_data_file)
+    data_store.add_water_logs([
+        WaterLog(amount_ml=250, timestamp=1622548800.0),
+        WaterLog(amount_ml=300, timestamp=1622552400.0),
+        WaterLog(amount_ml=350, timestamp=1622556000.0)
+    ])
+    
+    logs = data_store.iter_water_logs(start_time=1622550000.0)
+    assert next(logs) == (1, WaterLog(amount_ml=300, timestamp=1622552400.0))
+    assert [index for index, _ in logs] == [2]
+
+
+def test_get_latest_water_logs(temp_data_file):
+    """Test getting newest water logs, in and out of time order."""
+    data_store = DataStore(temp_data_file)
+    data_store.add_water_logs([
+        WaterLog(amount_ml=250, timestamp=1622548800.0),
+        WaterLog(amount_ml=300, timestamp=1622552400.0),
+        WaterLog(amount_ml=350, timestamp=1622556000.0)
+    ])
+    
+    latest = data_store.get_latest_water_logs(2)
+    assert [index for index, _ in latest] == [2, 1]
+    assert latest[0][1].amount_ml == 350
+    
+    data_store.add_water_log(WaterLog(amount_ml=200, timestamp=1622550000.0))
+    latest = data_store.get_latest_water_logs(3, start_time=1622549000.0)
+    assert [index for index, _ in latest] == [2, 1, 3]
+    assert data_store.get_latest_water_logs(0) == []
+
+
+def test_revision_changes_with_data(temp_data_file):
+    """Test data revision is incremented by every change."""
+    data_store = DataStore(temp_data_file)
+    revisions = [data_store.revision]
+    
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    revisions.append(data_store.revision)
+    data_store.update_water_log(0, WaterLog(amount_ml=300, timestamp=1622548800.0))
+    revisions.append(data_store.revision)
+    data_store.delete_water_log(0)
+    revisions.append(data_store.revision)
+    data_store.clear_all_data()
+    revisions.append(data_store.revision)
+    
+    assert len(set(revisions)) == len(revisions)
+    
+    # Reads and failed changes keep the revision
+    data_store.get_water_logs()
+    data_store.delete_water_log(0)
+    assert data_store.revision == revisions[-1]
+
+
+def test_export_data_async(temp_data_file):
+    """Test exporting data in a worker thread."""
+    data_store = DataStore(temp_data_file)
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=1622548800.0))
+    
+    export_path = temp_data_file + ".export"
+    try:
+        future = data_store.export_data_async(export_path)
+        
+        # Changes after the call are not part of the export
+        data_store.add_water_log(WaterLog(amount_ml=300, timestamp=1622552400.0))
+        assert future.result(timeout=5) is True
+        
+        assert data_store.import_data(export_path) is True
+        assert [log.amount_ml for _, log in data_store.get_water_logs()] == [250]
+    finally:
+        os.unlink(export_path)
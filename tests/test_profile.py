@@ -11,6 +11,7 @@ def test_gender_bonus():
     assert Gender.MALE.get_bonus() == 0.25
     assert Gender.FEMALE.get_bonus() == 0.1
     assert Gender.OTHER.get_bonus() == 0.15
+    assert Gender.MALE.bonus == 0.25
 
 
 def test_daily_target_male():
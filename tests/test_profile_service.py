@@ -6,21 +6,25 @@ from repository.data_store import DataStore
 from services.profile_service import ProfileService
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_data_store():
-    data_store = MagicMock(spec=DataStore)
+    return MagicMock(spec=DataStore)
+
+
+@pytest.fixture(autouse=True)
+def reset_mock_data_store(mock_data_store):
+    mock_data_store.reset_mock(return_value=True, side_effect=True)
     
     # Налаштування поведінки моку
-    data_store.load_profile.return_value = Profile(
+    mock_data_store.load_profile.return_value = Profile(
         height_cm=180,
         weight_kg=80.0,
         age_years=30,
         gender=Gender.MALE
     )
     
-    data_store.save_profile.return_value = True
-    
-    return data_store
+    mock_data_store.has_profile.return_value = True
+    mock_data_store.save_profile.return_value = True
 
 
 def test_get_profile(mock_data_store):
@@ -72,46 +76,30 @@ def test_create_profile(mock_data_store):
     mock_data_store.save_profile.assert_called_once()
 
 
-def test_create_profile_invalid_data(mock_data_store):
+@pytest.mark.parametrize("invalid_data", [
+    {"height_cm": 0},          # Перевірка валідації висоти
+    {"weight_kg": 0},          # Перевірка валідації ваги
+    {"age_years": 0},          # Перевірка валідації віку
+    {"gender": "INVALID"},     # Перевірка валідації статі
+    {"weight_kg": float("nan")},   # NaN не проходить порівняння з 0
+    {"weight_kg": float("inf")},   # Нескінченна вага
+    {"height_cm": float("inf")},   # Нескінченний зріст
+])
+def test_create_profile_invalid_data(mock_data_store, invalid_data):
     """Тест створення профілю з недійсними даними."""
     # Створення сервісу з моком сховища
     profile_service = ProfileService(mock_data_store)
     
-    # Перевірка валідації висоти
-    with pytest.raises(ValueError):
-        profile_service.create_profile(
-            height_cm=0,
-            weight_kg=70.0,
-            age_years=25,
-            gender="FEMALE"
-        )
-    
-    # Перевірка валідації ваги
-    with pytest.raises(ValueError):
-        profile_service.create_profile(
-            height_cm=170,
-            weight_kg=0,
-            age_years=25,
-            gender="FEMALE"
-        )
-    
-    # Перевірка валідації віку
-    with pytest.raises(ValueError):
-        profile_service.create_profile(
-            height_cm=170,
-            weight_kg=70.0,
-            age_years=0,
-            gender="FEMALE"
-        )
-    
-    # Перевірка валідації статі
+    profile_data = {
+        "height_cm": 170,
+        "weight_kg": 70.0,
+        "age_years": 25,
+        "gender": "FEMALE",
+        **invalid_data
+    }
+    
     with pytest.raises(ValueError):
-        profile_service.create_profile(
-            height_cm=170,
-            weight_kg=70.0,
-            age_years=25,
-            gender="INVALID"
-        )
+        profile_service.create_profile(**profile_data)
 
 
 def test_update_profile(mock_data_store):
@@ -147,7 +135,7 @@ def test_has_profile(mock_data_store):
     assert profile_service.has_profile() is True
     
     # Зміна поведінки моку
-    mock_data_store.load_profile.return_value = None
+    mock_data_store.has_profile.return_value = False
     
     # Перевірка, що профіль не існує
     assert profile_service.has_profile() is False
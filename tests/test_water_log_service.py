@@ -0,0 +1,51 @@
+import math
+import time
+import pytest
+from model.profile import WaterLog
+from repository.data_store import DataStore
+from services.profile_service import ProfileService
+from services.water_log_service import WaterLogService
+
+
+NOW = 1622548800.0
+DAY = 24 * 60 * 60
+
+
+@pytest.fixture
+def water_log_service(tmp_path, monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: NOW)
+    
+    data_store = DataStore(str(tmp_path / "watertracker.json"))
+    return WaterLogService(data_store, ProfileService(data_store))
+
+
+def test_daily_stats_expiry_when_oldest_record_leaves(water_log_service, monkeypatch):
+    """Test statistics stay valid until the oldest record leaves the last 24 hours."""
+    data_store = water_log_service.data_store
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=NOW - DAY - 60))
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=NOW - 3600))
+    data_store.add_water_log(WaterLog(amount_ml=200, timestamp=NOW - 60))
+    
+    expiry = water_log_service.get_daily_stats_expiry()
+    assert expiry == NOW - 3600 + DAY
+    assert water_log_service.get_daily_consumption() == 500
+    
+    # Unchanged data: same consumption until the expiry
+    monkeypatch.setattr(time, "time", lambda: expiry - 1)
+    assert water_log_service.get_daily_consumption() == 500
+    
+    monkeypatch.setattr(time, "time", lambda: expiry + 1)
+    assert water_log_service.get_daily_consumption() == 200
+    assert water_log_service.get_daily_stats_expiry() == NOW - 60 + DAY
+
+
+def test_daily_stats_expiry_when_later_record_enters(water_log_service):
+    """Test statistics expire when a record with a later timestamp enters the period."""
+    data_store = water_log_service.data_store
+    assert water_log_service.get_daily_stats_expiry() == math.inf
+    
+    data_store.add_water_log(WaterLog(amount_ml=250, timestamp=NOW + 600))
+    assert water_log_service.get_daily_stats_expiry() == NOW + 600
+    
+    data_store.add_water_log(WaterLog(amount_ml=300, timestamp=NOW - 3600))
+    assert water_log_service.get_daily_stats_expiry() == NOW + 600
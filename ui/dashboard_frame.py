@@ -2,9 +2,11 @@
 Dashboard frame for displaying current water consumption progress.
 """
 
+import bisect
 import time
 import tkinter as tk
-from datetime import datetime
+from datetime import date
+from functools import lru_cache, partial
 from typing import Optional
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
@@ -14,6 +16,58 @@ from services.profile_service import ProfileService
 from services.water_log_service import WaterLogService
 
 
+# Amount emojis: small, small-medium (>= 200 ml), medium (>= 300 ml), large (>= 500 ml)
+_AMOUNT_THRESHOLDS = (200, 300, 500)
+_AMOUNT_EMOJIS = ("💧", "🧊", "🥤", "🚰")
+
+# Meter status by progress: below 30%, from 30%, from 70%, goal reached
+_METER_THRESHOLDS = (0.3, 0.7, 1.0)
+_METER_STATUSES = ("Start!", "Going!", "Almost!", "Done! 🎉")
+
+# (consumed, remaining) label colors by progress: normal, from 70%, goal reached
+_LABEL_THRESHOLDS = (0.7, 1.0)
+_LABEL_COLORS = (
+    ("#0d6efd", "#fd7e14"),  # Blue - normal, orange - needs attention
+    ("#fd7e14", "#dc3545"),  # Orange - close, red - urgent
+    ("#198754", "#6c757d"),  # Green - goal reached, gray - done
+)
+
+# Motivational messages by progress: below 20%, from 20%, 50%, 80%, goal reached
+_MOTIVATION_THRESHOLDS = (0.2, 0.5, 0.8, 1.0)
+_MOTIVATIONS = (
+    "Stay hydrated, stay healthy! 🌟",
+    "Good start! Keep drinking! 🌊",
+    "Great progress! You're doing well! 💪",
+    "Almost there! Keep going! 🚀",
+    "Excellent! Goal achieved! 🏆",
+)
+
+# Preset amounts (ml) in the add-water dialog and (label, amount) quick-add buttons
+_DIALOG_AMOUNTS = (100, 200, 250, 300, 500)
+_QUICK_ADD_BUTTONS = (
+    ("💧 100ml", 100),
+    ("☕ 200ml", 200),
+    ("🥤 250ml", 250),
+    ("🍶 350ml", 350),
+    ("🚰 500ml", 500),
+)
+
+
+@lru_cache(maxsize=1024)
+def _format_minute(minute: int) -> str:
+    """
+    Formats a minute since the epoch as local "HH:MM" time.
+    
+    Args:
+        minute: Timestamp divided by 60.
+        
+    Returns:
+        Formatted time string.
+    """
+    local = time.localtime(minute * 60)
+    return f"{local.tm_hour:02d}:{local.tm_min:02d}"
+
+
 class ModernCircularMeter(ttk.Frame):
     """Modern widget for displaying circular progress bar with background."""
     
@@ -38,12 +92,18 @@ class ModernCircularMeter(ttk.Frame):
         self.text_color = "#212529"
         self.accent_color = "#198754"
         
+        # Arc color for each status in _METER_STATUSES
+        self._band_colors = (self.progress_color, self.progress_color, "#fd7e14", self.accent_color)
+        
+        # Window background, queried once
+        background = self.winfo_toplevel().cget("background")
+        
         # Canvas for drawing
         self.canvas = tk.Canvas(
             self, 
             width=self.size, 
             height=self.size, 
-            background=self.winfo_toplevel().cget("background"),
+            background=background,
             highlightthickness=0
         )
         self.canvas.pack()
@@ -63,7 +123,7 @@ class ModernCircularMeter(ttk.Frame):
         self.inner_circle = self.canvas.create_oval(
             self.size//2 - inner_size//2, self.size//2 - inner_size//2,
             self.size//2 + inner_size//2, self.size//2 + inner_size//2,
-            fill=self.winfo_toplevel().cget("background"),
+            fill=background,
             outline=""
         )
         
@@ -101,6 +161,9 @@ class ModernCircularMeter(ttk.Frame):
             fill="#6c757d"
         )
         
+        # Options last set on each canvas item
+        self._item_options = {}
+        
         # Initial value
         self.current_value = 0
         self.target_value = 0
@@ -119,6 +182,10 @@ class ModernCircularMeter(ttk.Frame):
         self.consumed = consumed
         self.target = target
         
+        # Nothing to redraw if the progress is unchanged
+        if self.target_value == self.current_value:
+            return
+        
         # Simple update without complex animation
         self.current_value = self.target_value
         self._update_display()
@@ -127,33 +194,43 @@ class ModernCircularMeter(ttk.Frame):
         """Updates the visual display."""
         # Update progress arc - запобігаємо повному колу при 100%
         extent = -359.9 if self.current_value >= 1.0 else -360 * self.current_value
-        self.canvas.itemconfig(self.progress_arc, extent=extent)
         
         # Update color based on progress
-        if self.current_value >= 1.0:
-            color = self.accent_color
-            status = "Done! 🎉"
-        elif self.current_value >= 0.7:
-            color = "#fd7e14"  # Orange
-            status = "Almost!"
-        elif self.current_value >= 0.3:
-            color = self.progress_color
-            status = "Going!"
-        else:
-            color = self.progress_color
-            status = "Start!"
+        band = bisect.bisect_right(_METER_THRESHOLDS, self.current_value)
+        color = self._band_colors[band]
+        status = _METER_STATUSES[band]
         
         # Change outline color for ARC style
-        self.canvas.itemconfig(self.progress_arc, outline=color)
+        self._itemconfig(self.progress_arc, extent=extent, outline=color)
         
         # Update text
         percent = int(self.current_value * 100)
-        self.canvas.itemconfig(self.percent_text, text=f"{percent}%")
-        self.canvas.itemconfig(self.status_text, text=status)
+        self._itemconfig(self.percent_text, text=f"{percent}%")
+        self._itemconfig(self.status_text, text=status)
+    
+    def _itemconfig(self, item, **options):
+        """
+        Configures canvas item, skipping the call if options are unchanged.
+        
+        Args:
+            item: Canvas item id.
+            **options: Item options.
+        """
+        if self._item_options.get(item) != options:
+            self.canvas.itemconfig(item, **options)
+            self._item_options[item] = options
 
 
 class WaterLogDialog(tk.Toplevel):
-    """Simple dialog for adding water log entries."""
+    """
+    Simple dialog for adding water log entries.
+    
+    The dialog is hidden instead of destroyed when closed; call show()
+    to open it again.
+    """
+    
+    # Screen size (width, height), queried on first open
+    _screen_size = None
     
     def __init__(self, parent, water_log_service: WaterLogService, on_add: callable):
         """Initialize water log dialog."""
@@ -161,7 +238,7 @@ class WaterLogDialog(tk.Toplevel):
         self.title("Add Water")
         self.resizable(False, False)
         self.transient(parent)
-        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self.close)
         
         self.water_log_service = water_log_service
         self.on_add = on_add
@@ -173,13 +250,34 @@ class WaterLogDialog(tk.Toplevel):
         # Create widgets
         self.create_widgets()
         
-        # Center and size window properly
-        self.update_idletasks()
+        # Center and size window properly (fixed size, no layout pass needed)
         width = 450  # Increased width
         height = 350  # Increased height
-        x = (self.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.winfo_screenheight() // 2) - (height // 2)
+        if WaterLogDialog._screen_size is None:
+            WaterLogDialog._screen_size = (self.winfo_screenwidth(), self.winfo_screenheight())
+        screen_width, screen_height = WaterLogDialog._screen_size
+        x = (screen_width // 2) - (width // 2)
+        y = (screen_height // 2) - (height // 2)
         self.geometry(f"{width}x{height}+{x}+{y}")
+        
+        self.show()
+    
+    def show(self):
+        """Reset fields and show dialog as modal window."""
+        self.amount_var.set(250)
+        self.note_var.set("")
+        
+        self.deiconify()
+        self.grab_set()
+        
+        # Focus
+        self.amount_entry.focus()
+        self.amount_entry.select_range(0, tk.END)
+    
+    def close(self):
+        """Hide dialog."""
+        self.grab_release()
+        self.withdraw()
     
     def create_widgets(self):
         """Create dialog widgets."""
@@ -205,13 +303,13 @@ class WaterLogDialog(tk.Toplevel):
         entry_row = ttk.Frame(amount_frame)
         entry_row.pack(fill=X)
         
-        amount_entry = ttk.Entry(
+        self.amount_entry = ttk.Entry(
             entry_row, 
             textvariable=self.amount_var,
             font=("TkDefaultFont", 12),
             width=8
         )
-        amount_entry.pack(side=LEFT, padx=(0, 8))
+        self.amount_entry.pack(side=LEFT, padx=(0, 8))
         
         ttk.Label(entry_row, text="ml", font=("TkDefaultFont", 12)).pack(side=LEFT)
         
@@ -219,12 +317,11 @@ class WaterLogDialog(tk.Toplevel):
         quick_frame = ttk.Frame(amount_frame)
         quick_frame.pack(fill=X, pady=(10, 0))
         
-        amounts = [100, 200, 250, 300, 500]
-        for amount in amounts:
+        for amount in _DIALOG_AMOUNTS:
             btn = ttk.Button(
                 quick_frame,
                 text=f"{amount}",
-                command=lambda a=amount: self.amount_var.set(a),
+                command=partial(self.amount_var.set, amount),
                 bootstyle="outline",
                 width=6
             )
@@ -263,7 +360,7 @@ class WaterLogDialog(tk.Toplevel):
         ttk.Button(
             button_frame, 
             text="Cancel", 
-            command=self.destroy,
+            command=self.close,
             width=10
         ).pack(side=LEFT)
         
@@ -274,10 +371,6 @@ class WaterLogDialog(tk.Toplevel):
             bootstyle="success",
             width=10
         ).pack(side=RIGHT)
-        
-        # Focus
-        amount_entry.focus()
-        amount_entry.select_range(0, tk.END)
     
     def add_water_log(self):
         """Add water log entry."""
@@ -310,7 +403,7 @@ class WaterLogDialog(tk.Toplevel):
             
             self.water_log_service.add_water_log(amount, note if note else None)
             self.on_add()
-            self.destroy()
+            self.close()
             
         except Exception as e:
             Messagebox.show_error(
@@ -322,6 +415,9 @@ class WaterLogDialog(tk.Toplevel):
 class DashboardFrame(ttk.Frame):
     """Simple dashboard frame for water consumption tracking."""
     
+    # Delay for coalescing refresh requests (ms)
+    REFRESH_DELAY_MS = 50
+    
     def __init__(self, parent, profile_service: ProfileService, 
                 water_log_service: WaterLogService):
         """Initialize dashboard frame."""
@@ -330,10 +426,25 @@ class DashboardFrame(ttk.Frame):
         self.profile_service = profile_service
         self.water_log_service = water_log_service
         
-        # Display variables
-        self.target_var = ttk.StringVar()
-        self.consumed_var = ttk.StringVar()
-        self.remaining_var = ttk.StringVar()
+        # Day shown in date label (ordinal) and logs list items keyed by
+        # (index, timestamp, amount), in display order
+        self._date_ordinal = None
+        self._log_items = {}
+        
+        # Scheduled refresh callback and add-water dialog (created on first use)
+        self._refresh_id = None
+        self._water_dialog: Optional[WaterLogDialog] = None
+        
+        # (target, consumed, remaining) shown in stats, their label colors
+        # and motivational message
+        self._shown_stats = None
+        self._shown_colors = None
+        self._shown_motivation = _MOTIVATIONS[0]
+        
+        # (data revision, day ordinal) of the last completed refresh and the
+        # time its statistics stay valid until
+        self._shown_key = None
+        self._shown_until = 0.0
         
         # Create interface
         self.create_widgets()
@@ -354,16 +465,16 @@ class DashboardFrame(ttk.Frame):
         
         self.date_label = ttk.Label(
             header_frame,
-            text=datetime.now().strftime("%A, %B %d, %Y"),
             font=("TkDefaultFont", 10),
             foreground="#6c757d"
         )
         self.date_label.pack(pady=(2, 0))
+        self.update_date_label()
         
         # Motivational subtitle
         self.motivation_label = ttk.Label(
             header_frame,
-            text="Stay hydrated, stay healthy! 🌟",
+            text=_MOTIVATIONS[0],
             font=("TkDefaultFont", 9),
             foreground="#198754"
         )
@@ -391,12 +502,11 @@ class DashboardFrame(ttk.Frame):
         buttons_row = ttk.Frame(quick_frame)
         buttons_row.pack()
         
-        amounts = [("💧 100ml", 100), ("☕ 200ml", 200), ("🥤 250ml", 250), ("🍶 350ml", 350), ("🚰 500ml", 500)]
-        for text, amount in amounts:
+        for text, amount in _QUICK_ADD_BUTTONS:
             btn = ttk.Button(
                 buttons_row,
                 text=text,
-                command=lambda a=amount: self.quick_add_water(a),
+                command=partial(self.quick_add_water, amount),
                 bootstyle="primary-outline",
                 width=8
             )
@@ -427,20 +537,21 @@ class DashboardFrame(ttk.Frame):
         row1 = ttk.Frame(stats_grid)
         row1.pack(fill=X, pady=3)
         ttk.Label(row1, text="🎯 Target:", width=12, foreground="#6c757d").pack(side=LEFT)
-        ttk.Label(row1, textvariable=self.target_var, font=("TkDefaultFont", 10, "bold"), foreground="#0d6efd").pack(side=LEFT)
+        self.target_label = ttk.Label(row1, font=("TkDefaultFont", 10, "bold"), foreground="#0d6efd")
+        self.target_label.pack(side=LEFT)
         
         # Row 2 - Consumed
         row2 = ttk.Frame(stats_grid)
         row2.pack(fill=X, pady=3)
         ttk.Label(row2, text="💙 Consumed:", width=12, foreground="#6c757d").pack(side=LEFT)
-        self.consumed_label = ttk.Label(row2, textvariable=self.consumed_var, font=("TkDefaultFont", 10, "bold"), foreground="#198754")
+        self.consumed_label = ttk.Label(row2, font=("TkDefaultFont", 10, "bold"), foreground="#198754")
         self.consumed_label.pack(side=LEFT)
         
         # Row 3 - Remaining
         row3 = ttk.Frame(stats_grid)
         row3.pack(fill=X, pady=3)
         ttk.Label(row3, text="⏰ Remaining:", width=12, foreground="#6c757d").pack(side=LEFT)
-        self.remaining_label = ttk.Label(row3, textvariable=self.remaining_var, font=("TkDefaultFont", 10, "bold"), foreground="#fd7e14")
+        self.remaining_label = ttk.Label(row3, font=("TkDefaultFont", 10, "bold"), foreground="#fd7e14")
         self.remaining_label.pack(side=LEFT)
         
         # Logs section
@@ -481,103 +592,147 @@ class DashboardFrame(ttk.Frame):
                 return
             
             self.water_log_service.add_water_log(amount, f"Quick add")
-            self.refresh()
+            self.schedule_refresh()
         except Exception as e:
             Messagebox.show_error(
                 title="Error",
                 message=f"Failed to add water log: {str(e)}"
             )
     
+    def schedule_refresh(self):
+        """Refresh dashboard shortly, coalescing repeated requests into one refresh."""
+        if self._refresh_id is None:
+            self._refresh_id = self.after(self.REFRESH_DELAY_MS, self._scheduled_refresh)
+    
+    def _scheduled_refresh(self):
+        """Run refresh requested by schedule_refresh."""
+        self._refresh_id = None
+        self.refresh()
+    
+    def destroy(self):
+        """Cancel pending scheduled refresh and destroy the frame."""
+        if self._refresh_id is not None:
+            self.after_cancel(self._refresh_id)
+            self._refresh_id = None
+        super().destroy()
+    
     def refresh(self):
-        """Refresh dashboard information."""
+        """
+        Refresh dashboard information.
+        
+        Nothing is refreshed if data and the current day have not changed
+        since the last refresh and no record has left or entered the
+        last 24 hours meanwhile.
+        """
+        shown_key = (self.water_log_service.get_data_revision(), date.today().toordinal())
+        if shown_key == self._shown_key and time.time() < self._shown_until:
+            return
+        
         try:
+            # Taken before statistics, so a record leaving the period
+            # meanwhile is caught by the next refresh
+            shown_until = self.water_log_service.get_daily_stats_expiry()
+            
             # Get profile
             profile = self.profile_service.get_profile()
             if not profile:
                 return
                 
             # Get information
-            daily_target = self.profile_service.get_daily_target()
-            daily_consumption = self.water_log_service.get_daily_consumption()
-            progress = self.water_log_service.get_progress_percentage()
-            remaining = max(0, daily_target - daily_consumption)
+            daily_target = profile.daily_target_ml
+            daily_consumption, progress, remaining = \
+                self.water_log_service.get_daily_stats(daily_target)
             
-            # Update display
-            self.target_var.set(f"{daily_target} ml")
-            self.consumed_var.set(f"{daily_consumption} ml")
-            self.remaining_var.set(f"{remaining} ml")
+            # Update display (only values that changed)
+            stats = (daily_target, daily_consumption, remaining)
+            shown = self._shown_stats or (None, None, None)
+            for label, value, shown_value in zip(
+                    (self.target_label, self.consumed_label, self.remaining_label), stats, shown):
+                if value != shown_value:
+                    label.config(text=f"{value} ml")
+            self._shown_stats = stats
             
             # Update colors based on progress
-            if progress >= 1.0:
-                self.consumed_label.config(foreground="#198754")  # Green - goal reached
-                self.remaining_label.config(foreground="#6c757d")  # Gray - done
-            elif progress >= 0.7:
-                self.consumed_label.config(foreground="#fd7e14")  # Orange - close
-                self.remaining_label.config(foreground="#dc3545")  # Red - urgent
-            else:
-                self.consumed_label.config(foreground="#0d6efd")  # Blue - normal
-                self.remaining_label.config(foreground="#fd7e14")  # Orange - needs attention
+            colors = _LABEL_COLORS[bisect.bisect_right(_LABEL_THRESHOLDS, progress)]
+            if colors != self._shown_colors:
+                self.consumed_label.config(foreground=colors[0])
+                self.remaining_label.config(foreground=colors[1])
+                self._shown_colors = colors
             
             # Update meter
             self.meter.set_value(progress, daily_consumption, daily_target)
             
             # Update date
-            self.date_label.config(text=datetime.now().strftime("%A, %B %d, %Y"))
+            self.update_date_label()
             
             # Update motivational message based on progress
-            if progress >= 1.0:
-                motivation = "Excellent! Goal achieved! 🏆"
-            elif progress >= 0.8:
-                motivation = "Almost there! Keep going! 🚀"
-            elif progress >= 0.5:
-                motivation = "Great progress! You're doing well! 💪"
-            elif progress >= 0.2:
-                motivation = "Good start! Keep drinking! 🌊"
-            else:
-                motivation = "Stay hydrated, stay healthy! 🌟"
-            
-            self.motivation_label.config(text=motivation)
+            motivation = _MOTIVATIONS[bisect.bisect_right(_MOTIVATION_THRESHOLDS, progress)]
+            if motivation != self._shown_motivation:
+                self.motivation_label.config(text=motivation)
+                self._shown_motivation = motivation
             
             # Update logs
             self.update_logs_list()
             
+            self._shown_key = shown_key
+            self._shown_until = shown_until
+            
         except Exception as e:
             Messagebox.show_error(
                 title="Error",
                 message=f"Failed to refresh dashboard: {str(e)}"
             )
     
+    def update_date_label(self):
+        """Update date label if the day has changed since last update."""
+        today = date.today()
+        if today.toordinal() == self._date_ordinal:
+            return
+        
+        self._date_ordinal = today.toordinal()
+        self.date_label.config(text=today.strftime("%A, %B %d, %Y"))
+    
     def update_logs_list(self):
-        """Update logs list."""
-        # Clear existing logs
-        for item in self.logs_tree.get_children():
-            self.logs_tree.delete(item)
-        
-        # Get recent logs
-        logs = self.water_log_service.get_water_logs()
-        
-        
-        if logs:
-            # Sort logs by timestamp (newest first) and show last 10
-            sorted_logs = sorted(logs, key=lambda x: x[1].timestamp, reverse=True)[:10]
-            
-            for index, log in sorted_logs:
-                time_str = datetime.fromtimestamp(log.timestamp).strftime("%H:%M")
+        """Update logs list, inserting and deleting only rows that changed."""
+        # Get last 10 logs (newest first)
+        logs = self.water_log_service.get_recent_water_logs(10)
+        keys = [(index, log.timestamp, log.amount_ml) for index, log in logs]
+        
+        # Nothing changed since last update
+        if keys == list(self._log_items):
+            return
+        
+        # Remove rows that are no longer shown
+        wanted = set(keys)
+        stale = [item for key, item in self._log_items.items() if key not in wanted]
+        if stale:
+            self.logs_tree.delete(*stale)
+        
+        # Insert new rows at their position, moving kept rows only if out of order
+        old_items = self._log_items
+        order = [item for key, item in old_items.items() if key in wanted]
+        items = {}
+        for position, key in enumerate(keys):
+            item = old_items.get(key)
+            if item is None:
+                _, timestamp, amount_ml = key
+                time_str = _format_minute(int(timestamp // 60))
                 
                 # Amount with colorful emojis
-                if log.amount_ml >= 500:
-                    amount_str = f"🚰 {log.amount_ml}ml"  # Large
-                elif log.amount_ml >= 300:
-                    amount_str = f"🥤 {log.amount_ml}ml"  # Medium
-                elif log.amount_ml >= 200:
-                    amount_str = f"🧊 {log.amount_ml}ml"  # Small-medium
-                else:
-                    amount_str = f"💧 {log.amount_ml}ml"  # Small
-                
-                # Add to tree (already sorted newest first)
-                self.logs_tree.insert("", "end", values=(time_str, amount_str))
+                emoji = _AMOUNT_EMOJIS[bisect.bisect_right(_AMOUNT_THRESHOLDS, amount_ml)]
+                item = self.logs_tree.insert("", position, values=(time_str, f"{emoji} {amount_ml}ml"))
+                order.insert(position, item)
+            elif order[position] != item:
+                self.logs_tree.move(item, "", position)
+                order.remove(item)
+                order.insert(position, item)
+            items[key] = item
+        
+        self._log_items = items
     
     def add_water_log(self):
         """Open dialog for adding water log entry."""
-        dialog = WaterLogDialog(self, self.water_log_service, self.refresh)
-        self.wait_window(dialog) 
\ No newline at end of file
+        if self._water_dialog is None:
+            self._water_dialog = WaterLogDialog(self, self.water_log_service, self.schedule_refresh)
+        else:
+            self._water_dialog.show() 
\ No newline at end of file
@@ -2,9 +2,12 @@
 Frame for viewing water consumption history.
 """
 
+import time
 import tkinter as tk
-from datetime import datetime, timedelta
-from typing import Callable, List, Tuple, Optional
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from functools import lru_cache, partial
+from typing import Callable, Dict, List, Tuple, Optional
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox, DatePickerDialog
@@ -13,11 +16,53 @@ from model.profile import WaterLog
 from services.water_log_service import WaterLogService
 
 
+@lru_cache(maxsize=4096)
+def _format_minute(minute: int) -> Tuple[str, str]:
+    """
+    Formats a minute since the epoch as local date and time.
+    
+    Args:
+        minute: Timestamp divided by 60.
+        
+    Returns:
+        Tuple ("YYYY-MM-DD", "HH:MM").
+    """
+    local = time.localtime(minute * 60)
+    return (f"{local.tm_year:04d}-{local.tm_mon:02d}-{local.tm_mday:02d}",
+            f"{local.tm_hour:02d}:{local.tm_min:02d}")
+
+
+def _parse_date(text: str) -> date:
+    """
+    Parses a date in YYYY-MM-DD format.
+    
+    Args:
+        text: Date string.
+        
+    Returns:
+        Parsed date.
+        
+    Raises:
+        ValueError: If text is not a valid date.
+    """
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        # Also accept dates without zero padding, e.g. 2024-1-5
+        return datetime.strptime(text, "%Y-%m-%d").date()
+
+
 class EditWaterLogDialog(tk.Toplevel):
-    """Dialog for editing a water consumption record."""
+    """
+    Dialog for editing a water consumption record.
+    
+    The dialog is hidden instead of destroyed when closed; call show()
+    to open it again for another record.
+    """
     
     def __init__(self, parent, water_log_service: WaterLogService, 
-                log_index: int, log: WaterLog, on_edit: Callable[[], None]):
+                log_index: int, log: WaterLog, 
+                on_edit: Callable[[int, Optional[WaterLog]], None]):
         """
         Initializes the water log editing dialog.
         
@@ -26,25 +71,25 @@ class EditWaterLogDialog(tk.Toplevel):
             water_log_service: Water log service.
             log_index: Record index in the list.
             log: Water consumption record object.
-            on_edit: Callback function called after editing the record.
+            on_edit: Callback function called after editing the record with
+                its index and updated record (None if it was deleted).
         """
         super().__init__(parent)
         self.title("Edit Water Log")
         self.resizable(False, False)
         self.transient(parent)
-        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self.close)
         
         self.water_log_service = water_log_service
-        self.log_index = log_index
-        self.log = log
         self.on_edit = on_edit
         
         # Variables
-        self.amount_var = ttk.IntVar(value=log.amount_ml)
-        self.note_var = ttk.StringVar(value=log.note or "")
+        self.amount_var = ttk.IntVar()
+        self.note_var = ttk.StringVar()
         
         # Widgets
         self.create_widgets()
+        self.set_log(log_index, log)
         
         # Window placement
         self.update_idletasks()
@@ -53,6 +98,41 @@ class EditWaterLogDialog(tk.Toplevel):
         x = (self.winfo_screenwidth() // 2) - (width // 2)
         y = (self.winfo_screenheight() // 2) - (height // 2)
         self.geometry(f"{width}x{height}+{x}+{y}")
+        
+        self.grab_set()
+    
+    def set_log(self, log_index: int, log: WaterLog):
+        """
+        Fills dialog fields with a record.
+        
+        Args:
+            log_index: Record index in the list.
+            log: Water consumption record object.
+        """
+        self.log_index = log_index
+        self.log = log
+        self.amount_var.set(log.amount_ml)
+        self.note_var.set(log.note or "")
+        self.time_value.config(
+            text=datetime.fromtimestamp(log.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        )
+    
+    def show(self, log_index: int, log: WaterLog):
+        """
+        Shows dialog as modal window for a record.
+        
+        Args:
+            log_index: Record index in the list.
+            log: Water consumption record object.
+        """
+        self.set_log(log_index, log)
+        self.deiconify()
+        self.grab_set()
+    
+    def close(self):
+        """Hides dialog."""
+        self.grab_release()
+        self.withdraw()
     
     def create_widgets(self):
         """Creates dialog widgets."""
@@ -66,11 +146,8 @@ class EditWaterLogDialog(tk.Toplevel):
         time_label = ttk.Label(time_frame, text="Time:", width=10, anchor=W)
         time_label.pack(side=LEFT, padx=(0, 5))
         
-        time_value = ttk.Label(
-            time_frame, 
-            text=datetime.fromtimestamp(self.log.timestamp).strftime("%Y-%m-%d %H:%M:%S")
-        )
-        time_value.pack(side=LEFT, fill=X, expand=YES)
+        self.time_value = ttk.Label(time_frame)
+        self.time_value.pack(side=LEFT, fill=X, expand=YES)
         
         # Water amount
         amount_frame = ttk.Frame(frame)
@@ -96,7 +173,7 @@ class EditWaterLogDialog(tk.Toplevel):
             quick_button = ttk.Button(
                 quick_frame,
                 text=f"{amount}ml",
-                command=lambda a=amount: self.amount_var.set(a),
+                command=partial(self.amount_var.set, amount),
                 bootstyle=OUTLINE
             )
             quick_button.pack(side=LEFT, padx=2)
@@ -134,7 +211,7 @@ class EditWaterLogDialog(tk.Toplevel):
         cancel_button = ttk.Button(
             button_frame, 
             text="Cancel", 
-            command=self.destroy,
+            command=self.close,
             bootstyle=SECONDARY
         )
         cancel_button.pack(side=RIGHT, padx=5)
@@ -153,13 +230,13 @@ class EditWaterLogDialog(tk.Toplevel):
                 return
             
             # Update record
-            self.water_log_service.update_water_log(self.log_index, amount, note)
+            updated_log = self.water_log_service.update_water_log(self.log_index, amount, note)
             
             # Call callback
-            self.on_edit()
+            self.on_edit(self.log_index, updated_log)
             
             # Close dialog
-            self.destroy()
+            self.close()
             
         except Exception as e:
             Messagebox.show_error(
@@ -174,10 +251,10 @@ class EditWaterLogDialog(tk.Toplevel):
             self.water_log_service.delete_water_log(self.log_index)
             
             # Call callback
-            self.on_edit()
+            self.on_edit(self.log_index, None)
             
             # Close dialog
-            self.destroy()
+            self.close()
             
         except Exception as e:
             Messagebox.show_error(
@@ -189,6 +266,17 @@ class EditWaterLogDialog(tk.Toplevel):
 class HistoryFrame(ttk.Frame):
     """Frame for viewing water consumption history."""
     
+    # Number of date ranges whose records are kept in cache
+    RANGE_CACHE_SIZE = 16
+    
+    # Delay before refresh after period changes (ms), so that a burst of
+    # changes is shown once
+    REFRESH_DELAY_MS = 250
+    
+    # Rows inserted into the table at once; the rest are inserted in
+    # further chunks between event processing
+    INSERT_CHUNK_ROWS = 100
+    
     def __init__(self, parent, water_log_service: WaterLogService, 
                 on_data_changed: Callable[[], None]):
         """
@@ -208,6 +296,32 @@ class HistoryFrame(ttk.Frame):
         self.end_date = datetime.now().date()
         self.start_date = self.end_date - timedelta(days=7)
         
+        # (logs, total amount) by (start date, end date), least recently
+        # used first, and data revision they were retrieved at
+        self._range_cache: OrderedDict = OrderedDict()
+        self._range_cache_revision = None
+        
+        # Scheduled refresh and row insertion callbacks, and records whose
+        # rows are not inserted yet
+        self._refresh_id = None
+        self._insert_id = None
+        self._pending_logs: List[Tuple[int, WaterLog]] = []
+        
+        # Records shown in the table and their table items by record index,
+        # record index by table item, and total amount shown in status line
+        self._log_by_index: Dict[int, WaterLog] = {}
+        self._item_by_index: Dict[int, str] = {}
+        self._index_by_item: Dict[str, int] = {}
+        self._shown_total = 0
+        
+        # (start date, end date, data revision) of records shown in the table,
+        # and text shown in status line
+        self._shown_key = None
+        self._shown_status = ""
+        
+        # Record editing dialog (created on first use)
+        self._edit_dialog: Optional[EditWaterLogDialog] = None
+        
         # Create interface
         self.create_widgets()
     
@@ -239,7 +353,7 @@ class HistoryFrame(ttk.Frame):
             period_button = ttk.Button(
                 period_frame,
                 text=period,
-                command=lambda d=days: self.set_period(d),
+                command=partial(self.set_period, days),
                 bootstyle=OUTLINE
             )
             period_button.pack(side=LEFT, padx=2)
@@ -254,8 +368,8 @@ class HistoryFrame(ttk.Frame):
         date_select_frame = ttk.Frame(range_frame)
         date_select_frame.pack(fill=X)
         
-        self.start_date_var = ttk.StringVar(value=self.start_date.strftime("%Y-%m-%d"))
-        self.end_date_var = ttk.StringVar(value=self.end_date.strftime("%Y-%m-%d"))
+        self.start_date_var = ttk.StringVar(value=self.start_date.isoformat())
+        self.end_date_var = ttk.StringVar(value=self.end_date.isoformat())
         
         start_date_label = ttk.Label(date_select_frame, text="From:")
         start_date_label.pack(side=LEFT, padx=(0, 5))
@@ -274,7 +388,7 @@ class HistoryFrame(ttk.Frame):
         start_date_button = ttk.Button(
             start_date_frame,
             text="📅",
-            command=lambda: self.show_date_picker(self.start_date_var),
+            command=partial(self.show_date_picker, self.start_date_var),
             width=3
         )
         start_date_button.pack(side=LEFT)
@@ -296,7 +410,7 @@ class HistoryFrame(ttk.Frame):
         end_date_button = ttk.Button(
             end_date_frame,
             text="📅",
-            command=lambda: self.show_date_picker(self.end_date_var),
+            command=partial(self.show_date_picker, self.end_date_var),
             width=3
         )
         end_date_button.pack(side=LEFT)
@@ -370,17 +484,17 @@ class HistoryFrame(ttk.Frame):
         self.start_date = self.end_date - timedelta(days=days - 1)  # -1 для включення поточного дня
         
         # Оновлення змінних
-        self.start_date_var.set(self.start_date.strftime("%Y-%m-%d"))
-        self.end_date_var.set(self.end_date.strftime("%Y-%m-%d"))
+        self.start_date_var.set(self.start_date.isoformat())
+        self.end_date_var.set(self.end_date.isoformat())
         
         # Оновлення таблиці
-        self.refresh()
+        self.schedule_refresh()
     
     def apply_date_range(self):
         """Застосовує вибраний діапазон дат."""
         try:
-            self.start_date = datetime.strptime(self.start_date_var.get(), "%Y-%m-%d").date()
-            self.end_date = datetime.strptime(self.end_date_var.get(), "%Y-%m-%d").date()
+            self.start_date = _parse_date(self.start_date_var.get())
+            self.end_date = _parse_date(self.end_date_var.get())
             
             # Перевірка, що початкова дата не пізніше кінцевої
             if self.start_date > self.end_date:
@@ -391,7 +505,7 @@ class HistoryFrame(ttk.Frame):
                 return
             
             # Оновлення таблиці
-            self.refresh()
+            self.schedule_refresh()
             
         except ValueError:
             Messagebox.show_error(
@@ -399,42 +513,59 @@ class HistoryFrame(ttk.Frame):
                 message="Please enter dates in the format YYYY-MM-DD."
             )
     
+    def schedule_refresh(self):
+        """
+        Refresh table after a short delay, restarting it on every new request.
+        
+        Nothing is refreshed if the table already shows the selected period
+        and data has not changed since.
+        """
+        if self._refresh_id is not None:
+            self.after_cancel(self._refresh_id)
+            self._refresh_id = None
+        
+        shown = (self.start_date, self.end_date, self.water_log_service.get_data_revision())
+        if shown != self._shown_key:
+            self._refresh_id = self.after(self.REFRESH_DELAY_MS, self._scheduled_refresh)
+    
+    def _scheduled_refresh(self):
+        """Run refresh requested by schedule_refresh."""
+        self._refresh_id = None
+        self.refresh()
+    
+    def destroy(self):
+        """Cancel pending scheduled refresh and destroy the frame."""
+        if self._refresh_id is not None:
+            self.after_cancel(self._refresh_id)
+            self._refresh_id = None
+        self._cancel_insert()
+        super().destroy()
+    
     def refresh(self):
         """Оновлює таблицю історії."""
         try:
-            # Очищення таблиці
-            for item in self.history_table.get_children():
-                self.history_table.delete(item)
+            # Очищення таблиці (одним викликом)
+            items = self.history_table.get_children()
+            if items:
+                self.history_table.delete(*items)
             
             # Отримання записів за вказаний період
-            start_datetime = datetime.combine(self.start_date, datetime.min.time())
-            end_datetime = datetime.combine(self.end_date, datetime.min.time())
+            logs, total_amount = self.get_range_logs()
+            self._log_by_index = dict(logs)
             
-            logs = self.water_log_service.get_water_logs_by_range(start_datetime, end_datetime)
-            
-            # Заповнення таблиці
-            total_amount = 0
-            for index, log in logs:
-                log_datetime = datetime.fromtimestamp(log.timestamp)
-                date_str = log_datetime.strftime("%Y-%m-%d")
-                time_str = log_datetime.strftime("%H:%M")
-                amount_str = f"{log.amount_ml} ml"
-                note = log.note or ""
-                
-                self.history_table.insert(
-                    "", "end", 
-                    values=(date_str, time_str, amount_str, note),
-                    tags=(str(index),)  # Зберігаємо індекс запису як тег
-                )
-                
-                total_amount += log.amount_ml
+            # Заповнення таблиці (перша порція одразу, решта поступово)
+            self._cancel_insert()
+            self._item_by_index = {}
+            self._index_by_item = {}
+            self._pending_logs = logs
+            self._insert_rows(0)
             
             # Оновлення статусного рядка
-            logs_count = len(logs)
-            period_str = f"{self.start_date.strftime('%Y-%m-%d')} to {self.end_date.strftime('%Y-%m-%d')}"
-            self.status_label.config(
-                text=f"Period: {period_str} | Total entries: {logs_count} | Total consumed: {total_amount} ml"
-            )
+            self._shown_total = total_amount
+            self.update_status()
+            
+            self._shown_key = (self.start_date, self.end_date, 
+                               self.water_log_service.get_data_revision())
             
         except Exception as e:
             Messagebox.show_error(
@@ -442,6 +573,94 @@ class HistoryFrame(ttk.Frame):
                 message=f"Failed to refresh history: {str(e)}"
             )
     
+    def _insert_rows(self, start: int):
+        """
+        Inserts a chunk of pending rows and schedules the next one.
+        
+        Args:
+            start: Position of the first row to insert in pending records.
+        """
+        self._insert_id = None
+        end = start + self.INSERT_CHUNK_ROWS
+        
+        # Treeview.insert() without its option formatting, which is
+        # the same for every row; names used per row are looked up once
+        call = self.tk.call
+        table = str(self.history_table)
+        row_values = self._row_values
+        item_by_index = self._item_by_index
+        index_by_item = self._index_by_item
+        for index, log in self._pending_logs[start:end]:
+            item = call(table, "insert", "", "end", "-values", row_values(log))
+            item_by_index[index] = item
+            index_by_item[item] = index
+        
+        if end < len(self._pending_logs):
+            self._insert_id = self.after(1, self._insert_rows, end)
+        else:
+            self._pending_logs = []
+    
+    def _cancel_insert(self):
+        """Cancels insertion of remaining rows."""
+        if self._insert_id is not None:
+            self.after_cancel(self._insert_id)
+            self._insert_id = None
+        self._pending_logs = []
+    
+    def _row_values(self, log: WaterLog) -> Tuple[str, str, str, str]:
+        """
+        Formats a record as table row values.
+        
+        Args:
+            log: Water consumption record object.
+            
+        Returns:
+            Tuple (date, time, amount, note).
+        """
+        date_str, time_str = _format_minute(int(log.timestamp // 60))
+        return date_str, time_str, f"{log.amount_ml} ml", log.note or ""
+    
+    def update_status(self):
+        """Updates status line with the period and records shown, if changed."""
+        period_str = f"{self.start_date.isoformat()} to {self.end_date.isoformat()}"
+        status = (f"Period: {period_str} | Total entries: {len(self._log_by_index)} | "
+                  f"Total consumed: {self._shown_total} ml")
+        if status != self._shown_status:
+            self.status_label.config(text=status)
+            self._shown_status = status
+    
+    def get_range_logs(self) -> Tuple[List[Tuple[int, WaterLog]], int]:
+        """
+        Returns records of the selected period, cached until data changes.
+        
+        Returns:
+            Tuple (list of (index, water log) tuples, total amount in ml).
+        """
+        # Records changed since they were cached
+        revision = self.water_log_service.get_data_revision()
+        if revision != self._range_cache_revision:
+            self._range_cache.clear()
+            self._range_cache_revision = revision
+        
+        key = (self.start_date, self.end_date)
+        cached = self._range_cache.get(key)
+        if cached is not None:
+            self._range_cache.move_to_end(key)
+            return cached
+        
+        start_datetime = datetime.combine(self.start_date, datetime.min.time())
+        end_datetime = datetime.combine(self.end_date, datetime.min.time())
+        
+        cached = (
+            self.water_log_service.get_water_logs_by_range(start_datetime, end_datetime),
+            self.water_log_service.get_total_amount_by_range(start_datetime, end_datetime)
+        )
+        
+        self._range_cache[key] = cached
+        if len(self._range_cache) > self.RANGE_CACHE_SIZE:
+            self._range_cache.popitem(last=False)
+        return cached
+    
     def on_item_double_click(self, event):
         """Обробник подвійного кліку на запис в таблиці."""
         # Отримання вибраного елемента
@@ -449,42 +668,84 @@ class HistoryFrame(ttk.Frame):
         if not selected_item:
             return
         
-        # Отримання тегу (індексу запису)
-        item_tags = self.history_table.item(selected_item, "tags")
-        if not item_tags:
+        # Отримання індексу запису
+        log_index = self._index_by_item.get(selected_item)
+        if log_index is None:
             return
         
         try:
-            log_index = int(item_tags[0])
-            
             # Отримання запису
-            logs = self.water_log_service.get_water_logs()
-            for index, log in logs:
-                if index == log_index:
-                    # Відкриття діалогу редагування
-                    dialog = EditWaterLogDialog(
-                        self, 
-                        self.water_log_service, 
-                        log_index, 
-                        log, 
-                        self.on_log_edited
-                    )
-                    self.wait_window(dialog)
-                    break
+            log = self.water_log_service.get_water_log(log_index)
+            
+            # Відкриття діалогу редагування
+            if self._edit_dialog is None:
+                self._edit_dialog = EditWaterLogDialog(
+                    self, 
+                    self.water_log_service, 
+                    log_index, 
+                    log, 
+                    self.on_log_edited
+                )
+            else:
+                self._edit_dialog.show(log_index, log)
         except (ValueError, IndexError) as e:
             Messagebox.show_error(
                 title="Error",
                 message=f"Failed to edit log: {str(e)}"
             )
     
-    def on_log_edited(self):
-        """Обробник події редагування запису."""
-        # Оновлення таблиці
-        self.refresh()
+    def on_log_edited(self, index: int, log: Optional[WaterLog]):
+        """
+        Обробник події редагування запису.
+        
+        Args:
+            index: Record index.
+            log: Updated record, or None if it was deleted.
+        """
+        item = self._item_by_index.get(index)
+        if item is None or self._pending_logs:
+            # Рядок не показано або таблиця ще заповнюється
+            self.refresh()
+        else:
+            self.update_row(index, item, log)
         
         # Виклик callback
         self.on_data_changed()
     
+    def update_row(self, index: int, item: str, log: Optional[WaterLog]):
+        """
+        Updates or deletes a single table row after its record changed.
+        
+        Args:
+            index: Record index.
+            item: Table item of the record.
+            log: Updated record, or None if it was deleted.
+        """
+        if log is not None:
+            # Оновлення лише зміненого рядка (час запису не змінюється)
+            self._shown_total += log.amount_ml - self._log_by_index[index].amount_ml
+            self._log_by_index[index] = log
+            self.history_table.item(item, values=self._row_values(log))
+        else:
+            # Видалення рядка; індекси наступних записів зменшуються на 1
+            self._shown_total -= self._log_by_index[index].amount_ml
+            self.history_table.delete(item)
+            self._log_by_index = {
+                i - (i > index): shown_log
+                for i, shown_log in self._log_by_index.items() if i != index
+            }
+            self._item_by_index = {
+                i - (i > index): shown_item
+                for i, shown_item in self._item_by_index.items() if i != index
+            }
+            self._index_by_item = {
+                shown_item: i for i, shown_item in self._item_by_index.items()
+            }
+        
+        self.update_status()
+        self._shown_key = (self.start_date, self.end_date, 
+                           self.water_log_service.get_data_revision())
+    
     def show_date_picker(self, date_var):
         """
         Показує діалог вибору дати.
@@ -493,7 +754,7 @@ class HistoryFrame(ttk.Frame):
             date_var: Змінна для збереження вибраної дати.
         """
         try:
-            current_date = datetime.strptime(date_var.get(), "%Y-%m-%d").date()
+            current_date = _parse_date(date_var.get())
         except ValueError:
             current_date = datetime.now().date()
             
@@ -501,4 +762,4 @@ class HistoryFrame(ttk.Frame):
         selected_date = dialog.date_selected
         
         if selected_date:
-            date_var.set(selected_date.strftime("%Y-%m-%d")) 
\ No newline at end of file
+            date_var.set(selected_date.isoformat()) 
\ No newline at end of file
@@ -7,6 +7,7 @@ from tkinter import messagebox
 from tkinter import filedialog
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
+from ttkbootstrap.toast import ToastNotification
 
 from ui.profile_frame import ProfileFrame
 from ui.dashboard_frame import DashboardFrame
@@ -16,6 +17,30 @@ from services.profile_service import ProfileService
 from services.water_log_service import WaterLogService
 
 
+# Main window size (px)
+WINDOW_WIDTH = 860
+WINDOW_HEIGHT = 600
+
+# Interval for writing pending data in the background (ms)
+AUTOFLUSH_INTERVAL_MS = 5000
+
+# How long success notifications stay on screen (ms)
+TOAST_DURATION_MS = 3000
+
+# Interval for checking whether a background export has finished (ms)
+EXPORT_POLL_INTERVAL_MS = 50
+
+# File types offered by export and import dialogs
+DATA_FILETYPES = (("JSON files", "*.json"), ("All files", "*.*"))
+
+# Text of the About dialog
+ABOUT_TEXT = (
+    "Water Tracker v0.1.0\n\n"
+    "A simple water tracking application.\n\n"
+    "Created with Python and ttkbootstrap."
+)
+
+
 class MainWindow(ttk.Window):
     """Main application window."""
     
@@ -24,13 +49,15 @@ class MainWindow(ttk.Window):
         super().__init__(title="Water Tracker", themename="cosmo", resizable=(False, False))
         
         # Initialize services
-        self.data_store = DataStore()
+        self.data_store = DataStore(write_back=True, background=True)
         self.profile_service = ProfileService(self.data_store)
         self.water_log_service = WaterLogService(self.data_store, self.profile_service)
         
-        # Window configuration
-        self.geometry("860x600")
-        self.position_center()
+        # Window configuration: size and centered position in one step,
+        # without forcing a layout pass before the widgets exist
+        xpos = (self.winfo_screenwidth() - WINDOW_WIDTH) // 2
+        ypos = (self.winfo_screenheight() - WINDOW_HEIGHT) // 2
+        self.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}+{xpos}+{ypos}")
         
         # Create menu
         self.create_menu()
@@ -39,8 +66,15 @@ class MainWindow(ttk.Window):
         self.main_container = ttk.Frame(self)
         self.main_container.pack(fill=BOTH, expand=YES, padx=10, pady=10)
         
-        # Create frames
-        self.create_frames()
+        # Frames, created on first use, and the frame currently shown
+        self._profile_frame = None
+        self._dashboard_frame = None
+        self._history_frame = None
+        self._current_frame = None
+        
+        # Write pending data periodically and before the window is closed
+        self._autoflush_id = self.after(AUTOFLUSH_INTERVAL_MS, self.autoflush)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Set initial interface state
         self.check_profile()
@@ -56,7 +90,7 @@ class MainWindow(ttk.Window):
         file_menu.add_separator()
         file_menu.add_command(label="Clear All Data", command=self.clear_all_data)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.quit)
+        file_menu.add_command(label="Exit", command=self.on_close)
         menu_bar.add_cascade(label="File", menu=file_menu)
         
         # Profile menu
@@ -77,46 +111,57 @@ class MainWindow(ttk.Window):
         
         self.config(menu=menu_bar)
     
-    def create_frames(self):
-        """Creates the main application frames."""
-        # Profile frame
-        self.profile_frame = ProfileFrame(
-            self.main_container, 
-            self.profile_service,
-            on_profile_updated=self.on_profile_updated
-        )
-        
-        # Dashboard frame
-        self.dashboard_frame = DashboardFrame(
-            self.main_container, 
-            self.profile_service,
-            self.water_log_service
-        )
-        
-        # History frame
-        self.history_frame = HistoryFrame(
-            self.main_container, 
-            self.water_log_service,
-            on_data_changed=self.refresh_dashboard
-        )
+    @property
+    def profile_frame(self) -> ProfileFrame:
+        """Profile frame, created on first access."""
+        if self._profile_frame is None:
+            self._profile_frame = ProfileFrame(
+                self.main_container, 
+                self.profile_service,
+                on_profile_updated=self.on_profile_updated
+            )
+        return self._profile_frame
+    
+    @property
+    def dashboard_frame(self) -> DashboardFrame:
+        """Dashboard frame, created on first access."""
+        if self._dashboard_frame is None:
+            self._dashboard_frame = DashboardFrame(
+                self.main_container, 
+                self.profile_service,
+                self.water_log_service
+            )
+        return self._dashboard_frame
+    
+    @property
+    def history_frame(self) -> HistoryFrame:
+        """History frame, created on first access."""
+        if self._history_frame is None:
+            self._history_frame = HistoryFrame(
+                self.main_container, 
+                self.water_log_service,
+                on_data_changed=self.refresh_dashboard
+            )
+        return self._history_frame
     
     def check_profile(self):
         """Checks for profile existence and shows the appropriate frame."""
         if self.profile_service.has_profile():
             self.show_dashboard_frame()
         else:
-            # Show profile creation frame without error messages
+            # Show profile creation frame without error messages;
+            # the greeting waits until the frame has been drawn
             self.show_profile_frame()
-            messagebox.showinfo(
+            self.after_idle(
+                messagebox.showinfo,
                 "Welcome", 
                 "Welcome to Water Tracker! Please create your profile to get started."
             )
     
     def show_profile_frame(self):
         """Shows the profile frame."""
-        self.hide_all_frames()
         self.profile_frame.load_profile()  # Load current profile if exists
-        self.profile_frame.pack(fill=BOTH, expand=YES)
+        self.show_frame(self.profile_frame)
     
     def show_dashboard_frame(self):
         """Shows the dashboard frame."""
@@ -129,9 +174,8 @@ class MainWindow(ttk.Window):
             self.show_profile_frame()
             return
         
-        self.hide_all_frames()
         self.dashboard_frame.refresh()
-        self.dashboard_frame.pack(fill=BOTH, expand=YES)
+        self.show_frame(self.dashboard_frame)
     
     def show_history_frame(self):
         """Shows the history frame."""
@@ -144,43 +188,66 @@ class MainWindow(ttk.Window):
             self.show_profile_frame()
             return
         
-        self.hide_all_frames()
         self.history_frame.refresh()
-        self.history_frame.pack(fill=BOTH, expand=YES)
+        self.show_frame(self.history_frame)
     
-    def hide_all_frames(self):
-        """Hides all frames."""
-        for frame in (self.profile_frame, self.dashboard_frame, self.history_frame):
-            frame.pack_forget()
+    def show_frame(self, frame: ttk.Frame):
+        """
+        Shows a frame in place of the one currently shown.
+        
+        Args:
+            frame: Frame to show.
+        """
+        if frame is self._current_frame:
+            return
+        
+        if self._current_frame is not None:
+            self._current_frame.pack_forget()
+        frame.pack(fill=BOTH, expand=YES)
+        self._current_frame = frame
     
     def on_profile_updated(self):
         """Profile update event handler."""
         self.show_dashboard_frame()
     
     def refresh_dashboard(self):
-        """Refreshes dashboard data."""
-        self.dashboard_frame.refresh()
+        """Schedules refresh of dashboard data (if it was created)."""
+        if self._dashboard_frame is not None:
+            self._dashboard_frame.schedule_refresh()
     
     def export_data(self):
         """Exports data to a file."""
         file_path = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=DATA_FILETYPES,
             title="Export Data"
         )
         
         if not file_path:
             return
         
-        if self.data_store.export_data(file_path):
-            messagebox.showinfo("Export Successful", f"Data exported to {file_path}")
+        # File is written in the background; report when it is done
+        self.check_export(self.data_store.export_data_async(file_path), file_path)
+    
+    def check_export(self, future, file_path: str):
+        """
+        Reports the result of a background export once it has finished.
+        
+        Args:
+            future: Future returned by export_data_async().
+            file_path: Path to export file.
+        """
+        if not future.done():
+            self.after(EXPORT_POLL_INTERVAL_MS, self.check_export, future, file_path)
+        elif future.result():
+            self.show_toast("Export Successful", f"Data exported to {file_path}")
         else:
             messagebox.showerror("Export Failed", "Failed to export data.")
     
     def import_data(self):
         """Imports data from a file."""
         file_path = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=DATA_FILETYPES,
             title="Import Data"
         )
         
@@ -188,20 +255,37 @@ class MainWindow(ttk.Window):
             return
         
         if self.data_store.import_data(file_path):
-            messagebox.showinfo("Import Successful", "Data imported successfully.")
+            self.show_toast("Import Successful", "Data imported successfully.")
             # Update interface
             self.check_profile()
         else:
             messagebox.showerror("Import Failed", "Failed to import data.")
     
+    def show_toast(self, title: str, message: str):
+        """
+        Shows a notification that closes by itself without blocking the window.
+        
+        Args:
+            title: Notification title.
+            message: Notification text.
+        """
+        ToastNotification(title=title, message=message, duration=TOAST_DURATION_MS).show_toast()
+    
     def show_about(self):
         """Shows information about the application."""
-        messagebox.showinfo(
-            "About Water Tracker",
-            "Water Tracker v0.1.0\n\n"
-            "A simple water tracking application.\n\n"
-            "Created with Python and ttkbootstrap."
-        )
+        messagebox.showinfo("About Water Tracker", ABOUT_TEXT)
+    
+    def autoflush(self):
+        """Hands pending data to the background writer and reschedules itself."""
+        self.data_store.flush(wait=False)
+        self._autoflush_id = self.after(AUTOFLUSH_INTERVAL_MS, self.autoflush)
+    
+    def on_close(self):
+        """Writes pending data and closes the application."""
+        self.after_cancel(self._autoflush_id)
+        if not self.data_store.flush():
+            messagebox.showerror("Save Failed", "Failed to save data.")
+        self.destroy()
     
     def clear_all_data(self):
         """Clears all application data after confirmation."""
@@ -222,7 +306,7 @@ class MainWindow(ttk.Window):
             self.data_store.clear_all_data()
             
             # Show success message
-            messagebox.showinfo(
+            self.show_toast(
                 "Data Cleared",
                 "All data has been successfully cleared.\n"
                 "You will now be redirected to create a new profile."
@@ -2,9 +2,11 @@
 Frame for managing user profile.
 """
 
-from typing import Callable, Optional
+import math
+from typing import Callable, Dict, Optional
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
+from ttkbootstrap.dialogs import Messagebox
 
 from model.profile import Gender, Profile
 from services.profile_service import ProfileService
@@ -13,6 +15,16 @@ from services.profile_service import ProfileService
 class ProfileFrame(ttk.Frame):
     """Frame for creating and editing user profile."""
     
+    # Numeric form fields: key in entries, label and unit
+    FIELDS = (
+        ("height", "Height:", "cm"),
+        ("weight", "Weight:", "kg"),
+        ("age", "Age:", "years"),
+    )
+    
+    # Gender options, in the order they are shown
+    GENDERS = tuple(gender.name for gender in Gender)
+    
     def __init__(self, parent, profile_service: ProfileService, on_profile_updated: Callable[[], None]):
         """
         Initializes the profile frame.
@@ -27,19 +39,17 @@ class ProfileFrame(ttk.Frame):
         self.profile_service = profile_service
         self.on_profile_updated = on_profile_updated
         
-        # Variables for storing input values
-        self.height_var = ttk.IntVar()
-        self.weight_var = ttk.DoubleVar()
-        self.age_var = ttk.IntVar()
+        # Variable for storing selected gender and entry fields by FIELDS key
         self.gender_var = ttk.StringVar(value="MALE")
-        
-        # Set default values
-        self.height_var.set(170)
-        self.weight_var.set(70.0)
-        self.age_var.set(30)
+        self.entries: Dict[str, ttk.Entry] = {}
         
         # Create interface
         self.create_widgets()
+        
+        # Set default values
+        self.set_entry(self.entries["height"], 170)
+        self.set_entry(self.entries["weight"], 70.0)
+        self.set_entry(self.entries["age"], 30)
     
     def create_widgets(self):
         """Creates frame widgets."""
@@ -61,57 +71,33 @@ class ProfileFrame(ttk.Frame):
         )
         description_label.pack(pady=5)
         
-        # Profile form
+        # Profile form: one grid row per field, entries take the spare width
         form_frame = ttk.Frame(self)
         form_frame.pack(fill=BOTH, padx=50, pady=20)
+        form_frame.columnconfigure(1, weight=1)
         
-        # Height
-        height_frame = ttk.Frame(form_frame)
-        height_frame.pack(fill=X, pady=10)
-        
-        height_label = ttk.Label(height_frame, text="Height:", width=10, anchor=W)
-        height_label.pack(side=LEFT, padx=(0, 5))
-        
-        height_entry = ttk.Entry(height_frame, textvariable=self.height_var)
-        height_entry.pack(side=LEFT, fill=X, expand=YES)
-        
-        height_unit = ttk.Label(height_frame, text="cm", width=5)
-        height_unit.pack(side=LEFT, padx=5)
-        
-        # Weight
-        weight_frame = ttk.Frame(form_frame)
-        weight_frame.pack(fill=X, pady=10)
-        
-        weight_label = ttk.Label(weight_frame, text="Weight:", width=10, anchor=W)
-        weight_label.pack(side=LEFT, padx=(0, 5))
-        
-        weight_entry = ttk.Entry(weight_frame, textvariable=self.weight_var)
-        weight_entry.pack(side=LEFT, fill=X, expand=YES)
-        
-        weight_unit = ttk.Label(weight_frame, text="kg", width=5)
-        weight_unit.pack(side=LEFT, padx=5)
-        
-        # Age
-        age_frame = ttk.Frame(form_frame)
-        age_frame.pack(fill=X, pady=10)
-        
-        age_label = ttk.Label(age_frame, text="Age:", width=10, anchor=W)
-        age_label.pack(side=LEFT, padx=(0, 5))
+        # Height, weight and age rows
+        for row, (name, label_text, unit_text) in enumerate(self.FIELDS):
+            field_label = ttk.Label(form_frame, text=label_text, width=10, anchor=W)
+            field_label.grid(row=row, column=0, sticky=W, padx=(0, 5), pady=10)
+            
+            entry = ttk.Entry(form_frame)
+            entry.grid(row=row, column=1, sticky=EW, pady=10)
+            self.entries[name] = entry
+            
+            field_unit = ttk.Label(form_frame, text=unit_text, width=5)
+            field_unit.grid(row=row, column=2, padx=5, pady=10)
         
-        age_entry = ttk.Entry(age_frame, textvariable=self.age_var)
-        age_entry.pack(side=LEFT, fill=X, expand=YES)
+        # Gender
+        gender_row = len(self.FIELDS)
         
-        age_unit = ttk.Label(age_frame, text="years", width=5)
-        age_unit.pack(side=LEFT, padx=5)
+        gender_label = ttk.Label(form_frame, text="Gender:", width=10, anchor=W)
+        gender_label.grid(row=gender_row, column=0, sticky=W, padx=(0, 5), pady=10)
         
-        # Gender
         gender_frame = ttk.Frame(form_frame)
-        gender_frame.pack(fill=X, pady=10)
-        
-        gender_label = ttk.Label(gender_frame, text="Gender:", width=10, anchor=W)
-        gender_label.pack(side=LEFT, padx=(0, 5))
+        gender_frame.grid(row=gender_row, column=1, columnspan=2, sticky=W, pady=10)
         
-        for gender in ["MALE", "FEMALE", "OTHER"]:
+        for gender in self.GENDERS:
             gender_radio = ttk.Radiobutton(
                 gender_frame, 
                 text=gender.capitalize(), 
@@ -159,6 +145,17 @@ class ProfileFrame(ttk.Frame):
         )
         info_label.pack(fill=X, pady=5)
     
+    def set_entry(self, entry: ttk.Entry, value):
+        """
+        Replaces the text of an entry field.
+        
+        Args:
+            entry: Entry field.
+            value: New value.
+        """
+        entry.delete(0, END)
+        entry.insert(0, str(value))
+    
     def load_profile(self):
         """Loads profile data if it exists."""
         try:
@@ -166,9 +163,9 @@ class ProfileFrame(ttk.Frame):
             
             if profile:
                 # Set field values
-                self.height_var.set(profile.height_cm)
-                self.weight_var.set(profile.weight_kg)
-                self.age_var.set(profile.age_years)
+                self.set_entry(self.entries["height"], profile.height_cm)
+                self.set_entry(self.entries["weight"], profile.weight_kg)
+                self.set_entry(self.entries["age"], profile.age_years)
                 self.gender_var.set(profile.gender.name)
             # If profile not found, keep default values
         except Exception as e:
@@ -179,14 +176,23 @@ class ProfileFrame(ttk.Frame):
         """Saves user profile."""
         try:
             # Get values from fields
-            height = self.height_var.get()
-            weight = self.weight_var.get()
-            age = self.age_var.get()
+            try:
+                height = int(self.entries["height"].get())
+                weight = float(self.entries["weight"].get())
+                age = int(self.entries["age"].get())
+                if not math.isfinite(weight):
+                    raise ValueError(f"weight is not finite: {weight}")
+            except ValueError:
+                Messagebox.show_error(
+                    title="Invalid Input",
+                    message="Height and age must be whole numbers, weight must be a number."
+                )
+                return
             gender = self.gender_var.get()
             
             # Validate input data
             if height <= 0 or weight <= 0 or age <= 0:
-                ttk.Messagebox.show_error(
+                Messagebox.show_error(
                     title="Invalid Input",
                     message="Height, weight, and age must be greater than 0."
                 )
@@ -199,7 +205,7 @@ class ProfileFrame(ttk.Frame):
             self.on_profile_updated()
             
         except Exception as e:
-            ttk.Messagebox.show_error(
+            Messagebox.show_error(
                 title="Error",
                 message=f"Failed to save profile: {str(e)}"
             ) 
\ No newline at end of file